@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from dataclasses import dataclass, field
 from typing import Any, ClassVar, Dict, Optional, Union
 
@@ -143,6 +144,8 @@ class AsynState(ShellStateHandler):
         noProcessEos: int = 0,
     ):
         # SLAC-specific, but doesn't hurt anyone
+        # Port names recur across IOCs; share one string for each:
+        portName = sys.intern(portName)
         self.ports[portName] = AsynSerialPort(
             context=self.get_load_context(),
             name=portName,
@@ -162,6 +165,8 @@ class AsynState(ShellStateHandler):
         noProcessEos: int = 0,
     ):
         # SLAC-specific, but doesn't hurt anyone
+        # Port names recur across IOCs; share one string for each:
+        portName = sys.intern(portName)
         self.ports[portName] = AsynIPPort(
             context=self.get_load_context(),
             name=portName,
@@ -6,6 +6,7 @@ import inspect
 import json
 import logging
 import pathlib
+import sys
 import textwrap
 import typing
 from contextlib import contextmanager
@@ -1334,6 +1335,8 @@ class AsynPortBase:
 class ShellStateHandler:
     """A helper to work with interpreting commands from shell scripts."""
     metadata_key: ClassVar[str]
+    #: IOC shell command name to ``handle_`` method name, for this class.
+    _handler_attrs_: ClassVar[Dict[str, str]] = {}
     parent: Optional[ShellStateHandler] = field(
         default=None, metadata=apischema.metadata.skip,
         repr=False, hash=False, compare=False
@@ -1347,6 +1350,15 @@ class ShellStateHandler:
         repr=False, hash=False, compare=False, init=False
     )
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Find handlers once per class, rather than for each instance:
+        cls._handler_attrs_ = {
+            sys.intern(attr.split("_", 1)[1]): attr
+            for attr in dir(cls)
+            if attr.startswith("handle_") and callable(getattr(cls, attr, None))
+        }
+
     def __post_init__(self):
         self._handlers.update(dict(self.find_handlers()))
         self._init_sub_handlers_()
@@ -1392,33 +1404,41 @@ class ShellStateHandler:
         """
 
         def wrap(func):
-            params = list(inspect.signature(func).parameters.items())[1:]
-            defaults = list(
-                None if param.default is inspect.Parameter.empty
-                else param.default
-                for _, param in params
-            )
+            @functools.lru_cache(maxsize=None)
+            def get_arg_info() -> Tuple[List[Tuple[str, Any]], List[Any]]:
+                # Inspected on first use, as most handlers are never called.
+                # Only the names, type names, and defaults of the parameters
+                # are needed, rather than the ``inspect.Parameter`` instances:
+                params = list(inspect.signature(func).parameters.values())[1:]
+                arg_info = [
+                    (param.name, getattr(param.annotation, "__name__", param.annotation))
+                    for param in params
+                ]
+                defaults = [
+                    None if param.default is inspect.Parameter.empty
+                    else param.default
+                    for param in params
+                ]
+                return arg_info, defaults
 
             @functools.wraps(func)
             def wrapped(self, *args):
+                arg_info, defaults = get_arg_info()
+                num_params = len(arg_info)
                 result = {}
-                if len(args) < len(params) and stub:
+                if len(args) < num_params and stub:
                     # Pad unspecified arguments with defaults or "None"
                     args = list(args) + defaults[len(args):]
 
-                if len(args) > len(params):
+                if len(args) > num_params:
                     result["argument_lint"] = "Too many arguments"
 
                 result["arguments"] = [
-                    {
-                        "name": name,
-                        "type": getattr(param.annotation, "__name__", param.annotation),
-                        "value": value,
-                    }
-                    for (name, param), value in zip(params, args)
+                    {"name": name, "type": type_name, "value": value}
+                    for (name, type_name), value in zip(arg_info, args)
                 ]
 
-                call_result = func(self, *args[:len(params)])
+                call_result = func(self, *args[:num_params])
                 if call_result is not None:
                     for key, value in call_result.items():
                         if key in result:
@@ -1436,16 +1456,11 @@ class ShellStateHandler:
 
     def find_handlers(self) -> Generator[Tuple[str, Callable], None, None]:
         """Find all IOC shell command handlers by name."""
-        for handler_obj in [self] + self.sub_handlers:
-            for attr in dir(handler_obj):
-                if attr.startswith("handle_"):
-                    obj = getattr(handler_obj, attr, None)
-                    if callable(obj):
-                        name = attr.split("_", 1)[1]
-                        yield name, obj
-
-            if handler_obj is not self:
-                yield from handler_obj.find_handlers()
+        for name, attr in self._handler_attrs_.items():
+            yield name, getattr(self, attr)
+
+        for sub_handler in self.sub_handlers:
+            yield from sub_handler.find_handlers()
 
     def pre_ioc_init(self):
         """Pre-iocInit hook."""
@@ -2,18 +2,22 @@ import ast
 import collections
 import copy
 import dataclasses
+import functools
 import html
 import logging
+import re
 import textwrap
+import typing
 from dataclasses import dataclass
 from typing import Any, ClassVar, Dict, Generator, List, Optional, Tuple, Union
 
-import graphviz as gv
-
 from .common import (FullLoadContext, LoadContext, PVRelations,
                      ScriptPVRelations)
 from .db import Database, RecordField, RecordInstance, RecordType
-from .gv_compat import AsyncDigraph
+
+if typing.TYPE_CHECKING:
+    # graphviz is only imported when rendering; see ``to_digraph``
+    import graphviz as gv
 
 logger = logging.getLogger(__name__)
 
@@ -154,17 +158,17 @@ class _GraphHelper:
         self.edges.append(edge)
         return edge
 
-    def _ready_for_digraph(self, graph: gv.Digraph):
+    def _ready_for_digraph(self, graph: "gv.Digraph"):
         """Hook when the user calls ``to_digraph``."""
         raise NotImplementedError()
 
     def to_digraph(
         self,
-        graph: Optional[gv.Digraph] = None,
+        graph: Optional["gv.Digraph"] = None,
         engine: str = "dot",
         font_name: Optional[str] = "Courier",
         format: str = "pdf",
-    ) -> gv.Digraph:
+    ) -> "gv.Digraph":
         """
         Create a graphviz digraph.
 
@@ -179,6 +183,8 @@ class _GraphHelper:
         format :
             The output format used for rendering (``'pdf'``, ``'png'``, ...).
         """
+        from .gv_compat import AsyncDigraph
+
         graph = graph or AsyncDigraph(format=format)
 
         # Call the subclass hook:
@@ -192,11 +198,11 @@ class _GraphHelper:
             graph.attr("node", fontname=font_name)
             graph.attr("edge", fontname=font_name)
 
+        newline = self.newline
         for node in self.nodes.values():
-            text = self.newline.join(node.text.splitlines())
             graph.node(
                 node.id,
-                label=f"< {text} >",
+                label=f"< {newline.join(node.text.splitlines())} >",
                 shape=self.shapes[node.highlighted],
                 fillcolor=self.fill_colors[node.highlighted],
                 style="filled",
@@ -221,6 +227,8 @@ class _GraphHelper:
 
 @dataclass
 class LinkInfo:
+    # One is created per link found; avoid a per-instance __dict__
+    __slots__ = ("record1", "field1", "record2", "field2", "info")
     record1: RecordInstance
     field1: RecordField
     record2: RecordInstance
@@ -228,13 +236,30 @@ class LinkInfo:
     info: List[str]
 
 
+@functools.lru_cache(maxsize=1024)
+def _escape_record_type(record_type: str) -> str:
+    """html.escape, cached for the few record types repeated across nodes."""
+    return html.escape(record_type)
+
+
+# Plain numeric literals (integer or floating point), the most common constant
+# link values, are matched without ``ast.literal_eval``:
+_NUMERIC_LITERAL_RE = re.compile(
+    r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$"
+)
+
+
+@functools.lru_cache(maxsize=8192)
 def is_supported_link(link: str) -> bool:
-    if link.startswith("#") or link.startswith("0x") or link.startswith("@"):
+    """Is ``link`` a record link (and not a constant or hardware address)?"""
+    if link.startswith(("#", "@", "0x")):
+        return False
+    if _NUMERIC_LITERAL_RE.match(link) is not None:
         return False
     try:
         ast.literal_eval(link)
     except Exception:
-        # Should not be an integer literal
+        # Not a literal (such as a string or JSON constant), so a record link
         return True
 
     return False
@@ -371,52 +396,61 @@ def build_database_relations(
     warned = set()
     by_record = collections.defaultdict(lambda: collections.defaultdict(list))
 
-    for rec1 in database.values():
-        rec1_rtype = record_types.get(rec1.record_type, None)
+    # Gather all links up front so the relation-building loop below is flat
+    all_links = [
+        (rec1, record_types.get(rec1.record_type, None), field1, link, info)
+        for rec1 in database.values()
         for field1, link, info in _get_links_for_record(
             rec1, record_types=record_types
-        ):
-            field1 = copy.deepcopy(field1)
-            # field1.context = rec1.context[:1] + field1.context
+        )
+    ]
+
+    for rec1, rec1_rtype, field1, link, info in all_links:
+        record_name, sep, field2_name = link.partition(".")
+        if sep:
+            link = record_name
+        elif field1.name == "FLNK":
+            field2_name = "PROC"
+        else:
+            field2_name = "VAL"
 
-            if not rec1.has_dbd_info and rec1_rtype:
-                field1.update_from_record_type(rec1_rtype)
+        rec2_name = aliases.get(link, link)
+        rec2 = database.get(rec2_name, None)
+        if rec2 is None and not is_supported_link(link):
+            # Constant or hardware link; skip before doing any copying
+            continue
 
-            if "." in link:
-                link, field2_name = link.split(".", 1)
-            elif field1.name == "FLNK":
-                field2_name = "PROC"
-            else:
-                field2_name = "VAL"
+        field1 = copy.deepcopy(field1)
+        # field1.context = rec1.context[:1] + field1.context
 
-            rec2_name = aliases.get(link, link)
-            rec2 = database.get(rec2_name, None)
+        if not rec1.has_dbd_info and rec1_rtype:
+            field1.update_from_record_type(rec1_rtype)
 
-            field2 = _field_from_record_relation(
-                record=rec2,
-                field_name=field2_name,
-                link_text=link,
-                record_types=record_types,
-            )
+        field2 = _field_from_record_relation(
+            record=rec2,
+            field_name=field2_name,
+            link_text=link,
+            record_types=record_types,
+        )
 
-            if field2 is None:
-                continue
+        if field2 is None:
+            continue
 
-            if rec2 is None:
-                warned.add(rec2_name)
-                logger.debug(
-                    "Linked record from %s.%s not in database: %s",
-                    rec1.name, field1.name, rec2_name
-                )
-            else:
-                # We may have updated information about the record field;
-                # but it's possible this is entirely unnecessary (TODO)
-                rec2_type = record_types.get(rec2.record_type, None)
-                if rec2_type is not None:
-                    field2.update_from_record_type(rec2_type)
+        if rec2 is None:
+            warned.add(rec2_name)
+            logger.debug(
+                "Linked record from %s.%s not in database: %s",
+                rec1.name, field1.name, rec2_name
+            )
+        else:
+            # We may have updated information about the record field;
+            # but it's possible this is entirely unnecessary (TODO)
+            rec2_type = record_types.get(rec2.record_type, None)
+            if rec2_type is not None:
+                field2.update_from_record_type(rec2_type)
 
-            by_record[rec1.name][rec2_name].append((field1, field2, info))
-            by_record[rec2_name][rec1.name].append((field2, field1, info))
+        by_record[rec1.name][rec2_name].append((field1, field2, info))
+        by_record[rec2_name][rec1.name].append((field2, field1, info))
 
     return dict(
         (key, dict(inner_dict))
@@ -581,33 +615,36 @@ def find_record_links(
     link_info : LinkInfo
         Link info
     """
-    checked = []
+    checked_set = set()
 
     if relations is None:
         relations = build_database_relations(database, record_types=record_types)
 
-    records_to_check = list(starting_records)
+    records_to_check = collections.deque(starting_records)
+    # Names which have been queued at any point; avoids re-scanning the queue
+    enqueued = set(starting_records)
 
     while records_to_check:
-        rec1 = database.get(records_to_check.pop(), None)
+        rec1 = database.get(records_to_check.popleft(), None)
         if rec1 is None:
             continue
 
-        checked.append(rec1.name)
+        checked_set.add(rec1.name)
         logger.debug("--- record %s ---", rec1.name)
 
         for rec2_name, fields in relations.get(rec1.name, {}).items():
-            if rec2_name in checked:
+            if rec2_name in checked_set:
                 continue
 
             rec2 = database.get(rec2_name, None)
             if rec2 is None:
                 continue
 
-            for field1, field2, info in fields:
-                if rec2_name not in checked and rec2_name not in records_to_check:
-                    records_to_check.append(rec2_name)
+            if rec2_name not in enqueued:
+                records_to_check.append(rec2_name)
+                enqueued.add(rec2_name)
 
+            for field1, field2, info in fields:
                 li = LinkInfo(
                     record1=rec1,
                     field1=field1,
@@ -733,12 +770,23 @@ class RecordLinkGraph(_GraphHelper):
         self._built = False
         self.relations = None
 
+    def _get_edge_style(self, info: List[str]) -> Dict[str, Any]:
+        """Get edge keyword arguments for the given link information."""
+        edge_kw = dict(self.default_edge_kwargs)
+        for key, to_find in self.edge_kwargs.items():
+            for match, value in to_find.items():
+                if match in info:
+                    edge_kw[key] = value
+                    break
+        return edge_kw
+
     def build(self):
         """Build the graph from the provided databases."""
         if self.database is None:
             raise ValueError("No database or records were added")
 
         edge_cache = set()
+        edge_styles = {}
 
         def add_edge(
             source: GraphNode,
@@ -790,16 +838,17 @@ class RecordLinkGraph(_GraphHelper):
 
             logger.debug("New edge %s -> %s", src, dest)
 
-            edge_kw = dict(self.default_edge_kwargs)
-            for key, to_find in self.edge_kwargs.items():
-                for match, value in to_find.items():
-                    if match in li.info:
-                        edge_kw[key] = value
-                        break
-
             if (src.id, dest.id) in edge_cache:
                 continue
 
+            # Only a handful of distinct link info lists exist, so the edge
+            # style is looked up once for each:
+            info_key = tuple(li.info)
+            edge_style = edge_styles.get(info_key, None)
+            if edge_style is None:
+                edge_style = edge_styles[info_key] = self._get_edge_style(li.info)
+            edge_kw = dict(edge_style)
+
             if li.field1.dtype == "DBF_FWDLINK":
                 # edge_kw["taillabel"] = "FLNK"
                 add_edge(
@@ -842,20 +891,22 @@ class RecordLinkGraph(_GraphHelper):
                 if rec_name in self.database.records:
                     self.get_node(rec_name)
 
+        records = self.database.records
+        format_text = self.text_format.format
         for node in self.nodes.values():
             # if self.sort_fields:
             #     node.text = "\n".join(sorted(node.text.splitlines()))
-            rec = self.database.records[node.label]
+            rec = records[node.label]
             if rec.aliases:
                 sub_header = html.escape(f"\nAlias: {', '.join(rec.aliases)}")
                 sub_header = f"""<TR><TD>{sub_header}</TD></TR>"""
             else:
                 sub_header = ""
 
-            fields = list(sorted(node.metadata["fields"].items()))
-            field_text = "\n".join(text for _, text in fields)
-            node.text = self.text_format.format(
-                rtype=html.escape(rec.record_type),
+            fields = node.metadata["fields"]
+            field_text = "\n".join([fields[name] for name in sorted(fields)])
+            node.text = format_text(
+                rtype=_escape_record_type(rec.record_type),
                 name=html.escape(rec.name),
                 field_lines=(sub_header + field_text).strip(),
             )
@@ -870,7 +921,7 @@ class RecordLinkGraph(_GraphHelper):
             for node in self.nodes.values()
         ]
 
-    def _ready_for_digraph(self, graph: gv.Digraph):
+    def _ready_for_digraph(self, graph: "gv.Digraph"):
         """Hook when the user calls ``to_digraph``."""
         if not self._built:
             self.build()
@@ -981,22 +1032,18 @@ def build_script_relations(
         if not rec:
             return "unknown"
 
-        if rec.owner and rec.owner != "unknown":
-            return rec.owner
+        owner = rec.owner
+        if owner and owner != "unknown":
+            return owner
 
-        if rec.context:
-            return rec.context[0].name
-
-        return "unknown"
+        context = rec.context
+        return context[0].name if context else "unknown"
 
     by_script = collections.defaultdict(lambda: collections.defaultdict(set))
     for rec1_name, list_of_rec2s in record_items:
-        rec1 = database.get(rec1_name, None)
+        owner1 = get_owner(database.get(rec1_name, None))
         for rec2_name in list_of_rec2s:
-            rec2 = database.get(rec2_name, None)
-
-            owner1 = get_owner(rec1)
-            owner2 = get_owner(rec2)
+            owner2 = get_owner(database.get(rec2_name, None))
             if owner1 != owner2:
                 by_script[owner2][owner1].add(rec2_name)
                 by_script[owner1][owner2].add(rec1_name)
@@ -1110,13 +1157,15 @@ class ScriptLinkGraph(_GraphHelper):
                     continue
                 self.get_node(script_b, text=script_b)
 
-                inter_lines = (
-                    [f"<b>{script_a}</b>", ""]
-                    + list(sorted(self.script_relations[script_a][script_b]))
-                    + [""]
-                    + [f"<b>{script_b}</b>", ""]
-                    + list(sorted(self.script_relations[script_b][script_a]))
-                )
+                inter_lines = [
+                    f"<b>{script_a}</b>",
+                    "",
+                    *sorted(script_a_relations[script_b]),
+                    "",
+                    f"<b>{script_b}</b>",
+                    "",
+                    *sorted(self.script_relations[script_b][script_a]),
+                ]
                 inter_node = f"{script_a}<->{script_b}"
                 self.get_node(inter_node, text="\n".join(inter_lines))
                 self.add_edge(script_a, inter_node)
@@ -1130,7 +1179,7 @@ class ScriptLinkGraph(_GraphHelper):
 
         self._built = True
 
-    def _ready_for_digraph(self, graph: gv.Digraph):
+    def _ready_for_digraph(self, graph: "gv.Digraph"):
         """Hook when the user calls ``to_digraph``."""
         if not self._built:
             self.build()
@@ -7,6 +7,7 @@ to API changes.
 """
 
 import asyncio
+import functools
 import logging
 import os
 
@@ -14,6 +15,20 @@ import graphviz as gv
 
 logger = logging.getLogger(__name__)
 
+_FILENAME_PLACEHOLDER = "{{whatrecord-dot-source}}"
+
+
+@functools.lru_cache(maxsize=64)
+def _command_template(engine, format, renderer=None, formatter=None):
+    """
+    Validated graphviz command line and rendered filename for the given
+    settings, with a placeholder in place of the source filename.
+    """
+    cmd, rendered = gv.backend.command(
+        engine, format, _FILENAME_PLACEHOLDER, renderer, formatter
+    )
+    return tuple(cmd), rendered
+
 
 async def async_render(
     engine, format, filepath, renderer=None, formatter=None, quiet=False
@@ -65,7 +80,12 @@ async def async_render(
     # Adapted from graphviz under the MIT License (MIT) Copyright (c) 2013-2020
     # Sebastian Bank
     dirname, filename = os.path.split(filepath)
-    cmd, rendered = gv.backend.command(engine, format, filename, renderer, formatter)
+    cmd_template, rendered = _command_template(engine, format, renderer, formatter)
+    cmd = [
+        filename if arg == _FILENAME_PLACEHOLDER else arg
+        for arg in cmd_template
+    ]
+    rendered = rendered.replace(_FILENAME_PLACEHOLDER, filename)
 
     if dirname:
         cwd = dirname
@@ -73,17 +93,19 @@ async def async_render(
     else:
         cwd = None
 
+    # The layout command writes the rendered file itself (``-O``), so there is
+    # no need to buffer its stdout; only stderr is kept for error reporting.
     proc = await asyncio.create_subprocess_exec(
         *cmd,
-        stdout=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
         stderr=asyncio.subprocess.PIPE,
         cwd=cwd,
     )
 
-    (stdout, stderr) = await proc.communicate()
+    (_, stderr) = await proc.communicate()
     if proc.returncode:
         raise gv.backend.CalledProcessError(
-            proc.returncode, cmd, output=stdout, stderr=stderr
+            proc.returncode, cmd, output=None, stderr=stderr
         )
     return rendered
 
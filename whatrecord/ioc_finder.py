@@ -1,3 +1,4 @@
+import asyncio
 import dataclasses
 import logging
 import pathlib
@@ -50,8 +51,10 @@ class IocScriptExternalLoader(_IocInfoFinder):
 
     async def update(self):
         result = await run_script_with_json_output(self.load_script)
-        for info in (result or {}):
-            self.add_or_update_entry(IocMetadata.from_dict(info))
+        self.scripts.update(
+            (info.script, info)
+            for info in map(IocMetadata.from_dict, result or [])
+        )
         return await super().update()
 
 
@@ -72,8 +75,10 @@ class IocScriptStaticInfoList(_IocInfoFinder):
             # The list is static; there wil be no updates
             return
 
-        for info in self.ioc_infos:
-            self.add_or_update_entry(IocMetadata.from_dict(info))
+        self.scripts.update(
+            (info.script, info)
+            for info in map(IocMetadata.from_dict, self.ioc_infos)
+        )
 
 
 @dataclasses.dataclass
@@ -90,5 +95,11 @@ class IocScriptStaticList(_IocInfoFinder):
             # The list is static; there wil be no updates
             return
 
-        for fn in self.script_list:
-            self.add_or_update_entry(IocMetadata.from_file(fn))
+        # Resolving paths and reading hashbangs blocks, so do it in threads
+        infos = await asyncio.gather(
+            *(
+                asyncio.to_thread(IocMetadata.from_file, fn)
+                for fn in self.script_list
+            )
+        )
+        self.scripts.update((info.script, info) for info in infos)
@@ -3,11 +3,17 @@ SLAC PCDS IocManager configuration file loading support.
 """
 
 import ast
+import concurrent.futures
+import copy
+import functools
+import json
 import logging
 import os
 import pathlib
 import re
-from typing import Any, Callable, List, Optional, Union
+import sys
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Tuple,
+                    Union)
 
 from .common import IocInfoDict
 from .util import find_binary_from_hashbang
@@ -15,8 +21,16 @@ from .util import find_binary_from_hashbang
 logger = logging.getLogger(__name__)
 
 KEY_RE = re.compile(r"([a-z_]+)\s*:", re.IGNORECASE)
+# Single-quoted strings (without embedded quotes or escapes), double-quoted
+# strings, and Python keywords, in the order they appear:
+JSON_TOKEN_RE = re.compile(
+    r"""'([^'"\\]*)'|"(?:[^"\\]|\\.)*"|\b(True|False|None)\b"""
+)
+PYTHON_TO_JSON_KEYWORDS = {"True": "true", "False": "false", "None": "null"}
 EPICS_SITE_TOP = os.environ.get("EPICS_SITE_TOP", "/reg/g/pcds/epics")
 REQUIRED_KEYS = {"id", "host", "port", "dir", "base_version"}
+# Values shared by many IOCs, which are interned to save memory:
+INTERN_VALUE_KEYS = {"host", "dir", "base_version"}
 
 
 def validate_config_keys(cfg: IocInfoDict) -> bool:
@@ -24,7 +38,59 @@ def validate_config_keys(cfg: IocInfoDict) -> bool:
     return all(key in cfg and cfg[key] for key in REQUIRED_KEYS)
 
 
-def parse_config(lines: List[str]) -> List[IocInfoDict]:
+def _to_json_token(match: re.Match) -> str:
+    """Convert a Python literal token from ``JSON_TOKEN_RE`` to JSON."""
+    single_quoted, keyword = match.group(1, 2)
+    if single_quoted is not None:
+        return f'"{single_quoted}"'
+    if keyword is not None:
+        return PYTHON_TO_JSON_KEYWORDS[keyword]
+    double_quoted = match.group(0)
+    if "\\" in double_quoted:
+        # JSON and Python escapes differ; leave these to ``ast.literal_eval``
+        raise ValueError("Escaped double-quoted string")
+    return double_quoted
+
+
+def _reject_json_constant(constant: str) -> Any:
+    """NaN and Infinity are not Python literals; see ``_fix_entry``."""
+    raise ValueError(f"Unsupported constant: {constant}")
+
+
+def _quote_key(match: re.Match) -> str:
+    """Quote a configuration key from ``KEY_RE``."""
+    return f'"{match[1]}":'
+
+
+def _intern_entry(entry: IocInfoDict) -> IocInfoDict:
+    """Intern the keys and low-cardinality values of a configuration entry."""
+    return {
+        sys.intern(key): (
+            sys.intern(value)
+            if key in INTERN_VALUE_KEYS and isinstance(value, str)
+            else value
+        )
+        for key, value in entry.items()
+    }
+
+
+def _fix_entry(entry: str) -> IocInfoDict:
+    """Quote the keys of a raw configuration entry and evaluate it."""
+    # A replacement function is quicker than expanding a template per match
+    entry = KEY_RE.sub(_quote_key, entry.strip(", \t"))
+    try:
+        # Typical entries are JSON but for their quoting; json is much faster
+        # than evaluating the literal
+        result = json.loads(
+            JSON_TOKEN_RE.sub(_to_json_token, entry),
+            parse_constant=_reject_json_constant,
+        )
+    except ValueError:
+        result = ast.literal_eval(entry)
+    return _intern_entry(result)
+
+
+def parse_config(lines: Iterable[str]) -> List[IocInfoDict]:
     """
     Parse an IOC manager config to get its IOCs.
 
@@ -36,8 +102,8 @@ def parse_config(lines: List[str]) -> List[IocInfoDict]:
 
     Parameters
     ----------
-    lines : list of str
-        List of raw configuration file lines.
+    lines : iterable of str
+        Raw configuration file lines, without line endings.
 
     Returns
     -------
@@ -66,25 +132,37 @@ def parse_config(lines: List[str]) -> List[IocInfoDict]:
                 entry = line
         elif entry is not None:
             entry += line
-            if "}" in entry:
+            # The entry so far had no closing brace, so only check this line
+            if "}" in line:
                 # {id: ...
                 #  ... }   <-- closing line
                 entries.append(entry)
                 entry = None
 
-    def fix_entry(entry):
-        return ast.literal_eval(KEY_RE.sub(r'"\1":', entry.strip(", \t")))
-
     result = []
     for entry in entries:
         try:
-            result.append(fix_entry(entry))
+            result.append(_fix_entry(entry))
         except Exception:
             logger.error("Failed to fix up IOC manager entry: %s", entry)
 
     return result
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_config_file(
+    fn: str, mtime_ns: int, size: int
+) -> List[IocInfoDict]:
+    """
+    Read and parse a configuration file.
+
+    Cached by modification time and size, such that unchanged configuration
+    files are not re-parsed.  Callers must not modify the result.
+    """
+    with open(fn, "rt") as f:
+        return parse_config(line.rstrip("\r\n") for line in f)
+
+
 def load_config_file(fn: Union[str, pathlib.Path]) -> List[IocInfoDict]:
     """
     Load a configuration file and return the IOCs it contains.
@@ -99,51 +177,101 @@ def load_config_file(fn: Union[str, pathlib.Path]) -> List[IocInfoDict]:
     ioc_info : list of IOC info dictionaries
         List of IOC info
     """
-    with open(fn, "rt") as f:
-        lines = f.read().splitlines()
-
-    iocs = parse_config(lines)
+    stat = os.stat(fn)
+    iocs = copy.deepcopy(
+        _parse_config_file(str(fn), stat.st_mtime_ns, stat.st_size)
+    )
 
-    for ioc in list(iocs):
+    # Shared by all IOCs from this file:
+    config_file = sys.intern(str(fn))
+    valid = []
+    for ioc in iocs:
         # For now, assume old database syntax by specifying 3.15:
         ioc["base_version"] = "3.15"
         if not validate_config_keys(ioc):
-            iocs.remove(ioc)
-        else:
-            # Add "config_file" and rename some keys:
-            ioc["config_file"] = str(fn)
-            ioc["name"] = ioc.pop("id")
-            ioc["script"] = find_stcmd(ioc["dir"], ioc["name"])
-            ioc["binary"] = find_binary_from_hashbang(ioc["script"])
+            continue
 
-    return iocs
+        # Add "config_file" and rename some keys:
+        ioc["config_file"] = config_file
+        ioc["name"] = ioc.pop("id")
+        ioc["script"] = find_stcmd(ioc["dir"], ioc["name"])
+        ioc["binary"] = _find_binary(ioc["script"])
+        valid.append(ioc)
+
+    return valid
+
+
+@functools.lru_cache(maxsize=4096)
+def _find_binary_from_hashbang(script: str, mtime_ns: int) -> Optional[str]:
+    """Cached by startup script modification time; see ``_find_binary``."""
+    return find_binary_from_hashbang(script)
+
+
+def _find_binary(script: str) -> Optional[str]:
+    """Find the binary from a startup script hashbang, re-reading on change."""
+    try:
+        mtime_ns = os.stat(script).st_mtime_ns
+    except OSError:
+        return None
+    return _find_binary_from_hashbang(script, mtime_ns)
+
+
+# (directory, ioc_id) to the startup script found by ``find_stcmd``
+_stcmd_cache: Dict[Tuple[str, str], str] = {}
 
 
 def find_stcmd(directory: str, ioc_id: str) -> str:
     """Find the startup script st.cmd for a given IOC."""
+    cache_key = (directory, ioc_id)
     if directory.startswith("ioc"):
         directory = os.path.join(EPICS_SITE_TOP, directory)
 
     suffix = ("iocBoot", ioc_id, "st.cmd")
     # Templated IOCs are... different:
     options = [
-        os.path.join(directory, "children", "build", *suffix),
-        os.path.join(directory, "build", *suffix),
-        os.path.join(directory, *suffix),
-        os.path.join(directory, "st.cmd"),
+        ("children", os.path.join(directory, "children", "build", *suffix)),
+        ("build", os.path.join(directory, "build", *suffix)),
+        ("iocBoot", os.path.join(directory, *suffix)),
+        ("st.cmd", os.path.join(directory, "st.cmd")),
     ]
 
-    for option in options:
-        if os.path.exists(option):
+    cached = _stcmd_cache.get(cache_key, None)
+    if cached is not None:
+        # Still use the script found last time, unless it was removed or a
+        # script of higher priority has since appeared:
+        higher = [option for _, option in options]
+        higher = higher[:higher.index(cached)]
+        if os.path.exists(cached) and not any(map(os.path.exists, higher)):
+            return cached
+
+    # List the directory once and only check options that could exist, rather
+    # than checking each (on a possibly slow network filesystem):
+    try:
+        with os.scandir(directory) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        entries = set()
+
+    for first_part, option in options:
+        if first_part in entries and os.path.exists(option):
+            # Only cache found scripts; a guess may exist later on
+            _stcmd_cache[cache_key] = option
             return option
 
     # Guess at what's correct:
-    return options[-1]
+    return options[-1][1]
+
+
+@functools.lru_cache(maxsize=2048)
+def _resolve_config_path(config: str) -> pathlib.Path:
+    """Resolve a configuration file path, cached across reloads."""
+    return pathlib.Path(config).resolve()
 
 
 def get_iocs_from_configs(
     configs: List[Union[str, pathlib.Path]],
-    sorter: Optional[Callable[[IocInfoDict], Any]] = None
+    sorter: Optional[Callable[[IocInfoDict], Any]] = None,
+    max_workers: int = 8,
 ) -> List[IocInfoDict]:
     """
     Get IOC information in a list of dictionaries.
@@ -154,24 +282,37 @@ def get_iocs_from_configs(
         Configuration filenames to load.
     sorter : callable, optional
         Sort IOCs with this, defaults to sorting by host name and then IOC name.
+    max_workers : int, optional
+        Load up to this many configuration files at once.  Loading is mostly
+        I/O (reading the file and looking for startup scripts), often on a
+        network filesystem, and so may be done in threads.
 
     Returns
     -------
     ioc_info : list of IOC info dictionaries
         List of IOC info
     """
-    configs = [
-        pathlib.Path(config).resolve()
+    # Resolve (and de-duplicate) the configuration paths, keeping their order:
+    configs = dict.fromkeys(
+        _resolve_config_path(str(config))
         for config in configs or []
-    ]
+    )
 
     def default_sorter(ioc):
         return (ioc["host"], ioc["name"])
 
+    if len(configs) > 1 and max_workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(configs))
+        ) as executor:
+            per_config = list(executor.map(load_config_file, configs))
+    else:
+        per_config = [load_config_file(fn) for fn in configs]
+
     iocs = (
         ioc
-        for fn in set(configs)
-        for ioc in load_config_file(fn)
+        for config_iocs in per_config
+        for ioc in config_iocs
     )
 
-    return list(sorted(iocs, key=sorter or default_sorter))
+    return sorted(iocs, key=sorter or default_sorter)
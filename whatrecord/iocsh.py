@@ -1,3 +1,5 @@
+import copy
+import functools
 from typing import Optional
 
 from epicsmacrolib import IocshRedirect, IocshSplit, split_iocsh_line
@@ -8,6 +10,17 @@ from .macro import MacroContext
 __all__ = ["split_iocsh_line", "parse_iocsh_line", "IocshRedirect", "IocshSplit"]
 
 
+@functools.lru_cache(maxsize=8192)
+def _split_iocsh_line(line: str, string_encoding: str) -> IocshSplit:
+    """
+    Cached ``split_iocsh_line``.
+
+    Splitting only depends on the (already macro-expanded) line, and the same
+    lines tend to recur across startup scripts.  Do not modify the result.
+    """
+    return split_iocsh_line(line, string_encoding=string_encoding)
+
+
 def parse_iocsh_line(
     line: str, *,
     context: Optional[LoadContext] = None,
@@ -50,28 +63,28 @@ def parse_iocsh_line(
         return result
 
     if macro_context is not None:
-        line = macro_context.expand(line)
-
-    # * Skip leading white-space coming from a macro
-    line = line.lstrip()
+        # * Skip leading white-space coming from a macro
+        line = macro_context.expand(line).lstrip()
 
     # * Echo non-empty lines read from a script.
     # * Comments delineated with '#-' aren't echoed.
-    if not prompt:
-        if not line.startswith('#-'):
-            result.outputs.append(line)
+    if not prompt and not line.startswith('#-'):
+        result.outputs.append(line)
 
     # * Ignore lines that became a comment or empty after macro expansion
     if not line or line.startswith('#'):
         return result
 
-    split = split_iocsh_line(line, string_encoding=string_encoding)
-    result.argv = split.argv
+    split = _split_iocsh_line(line, string_encoding)
+    # Copy from the cached split, which is shared between calls:
+    result.argv = list(split.argv)
 
     # Only set the following if necessary; apischema can skip serialization
     # otherwise.
     if split.redirects:
-        result.redirects = list(split.redirects.values())
+        result.redirects = [
+            copy.copy(redirect) for redirect in split.redirects.values()
+        ]
 
     if split.error:
         result.error = split.error
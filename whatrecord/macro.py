@@ -1,8 +1,10 @@
 import ast
 import dataclasses
+import functools
 import os
 import re
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Container, Dict, Optional, Tuple
 
 import apischema
 from epicsmacrolib import MacroContext
@@ -29,10 +31,21 @@ def macros_from_string(
     macros : Dict[str, str]
         Macro key to value.
     """
-    if not macro_string.strip():
+    if not macro_string.strip(", \t\r\n"):
+        # Only separators: nothing to define
         return {}
-    macro_context = MacroContext(use_environment=use_environment)
-    return macro_context.define_from_string(macro_string)
+    if use_environment:
+        # The environment may change between calls; do not cache these
+        macro_context = MacroContext(use_environment=True)
+        return macro_context.define_from_string(macro_string)
+    return dict(_macros_from_string(macro_string))
+
+
+@functools.lru_cache(maxsize=1024)
+def _macros_from_string(macro_string: str) -> Tuple[Tuple[str, str], ...]:
+    """Cached, immutable version of ``macros_from_string``."""
+    macro_context = MacroContext(use_environment=False)
+    return tuple(macro_context.define_from_string(macro_string).items())
 
 
 class PassthroughMacroContext(MacroContext):
@@ -65,6 +78,11 @@ class _SerializedMacroContext:
 
 
 RE_MACRO_KEY_SKIP = []
+# All of RE_MACRO_KEY_SKIP as a single pattern (or None, if there are none):
+RE_MACRO_KEY_SKIP_COMBINED = None
+# The above are compiled on first use; see ``_get_macro_key_skip``:
+_macro_key_skip_ready = False
+_macro_key_skip_lock = threading.RLock()
 
 # This becomes more of a concern when run on CI.
 # Consider tweaking this for your purposes in MACRO_KEY_SKIP or
@@ -80,17 +98,41 @@ MACRO_KEY_SKIP_DEFAULT = [
 def set_serialization_settings(skip: Optional[str] = settings.MACRO_KEY_SKIP):
     """Update macro serialization settings."""
     global RE_MACRO_KEY_SKIP
+    global RE_MACRO_KEY_SKIP_COMBINED
+    global _macro_key_skip_ready
     if skip:
         skip_regex = ast.literal_eval(skip)
     else:
         skip_regex = MACRO_KEY_SKIP_DEFAULT
-    RE_MACRO_KEY_SKIP = [re.compile(regex) for regex in skip_regex]
-
+    with _macro_key_skip_lock:
+        RE_MACRO_KEY_SKIP = [re.compile(regex) for regex in skip_regex]
+        RE_MACRO_KEY_SKIP_COMBINED = (
+            re.compile("|".join(f"(?:{regex})" for regex in skip_regex))
+            if skip_regex else None
+        )
+        _macro_key_skip_ready = True
 
-set_serialization_settings()
 
+def _get_macro_key_skip() -> Optional[re.Pattern]:
+    """
+    Get ``RE_MACRO_KEY_SKIP_COMBINED``, applying the default serialization
+    settings on first use.
 
-def should_serialize_key(key: str, value: str) -> bool:
+    This keeps regular expression compilation out of import time, for
+    those that never serialize macros.
+    """
+    if not _macro_key_skip_ready:
+        with _macro_key_skip_lock:
+            if not _macro_key_skip_ready:
+                set_serialization_settings()
+    return RE_MACRO_KEY_SKIP_COMBINED
+
+
+def should_serialize_key(
+    key: str,
+    value: str,
+    environment_keys: Optional[Container[str]] = None,
+) -> bool:
     """
     Should ``key`` be serialized when saving macros?
 
@@ -109,6 +151,9 @@ def should_serialize_key(key: str, value: str) -> bool:
         The macro/environment variable name.
     value : str
         The value associated with the macro.
+    environment_keys : Container[str], optional
+        A snapshot of environment variable names to check against, for
+        callers checking many keys at once.  Defaults to ``os.environ``.
 
     Returns
     -------
@@ -120,22 +165,33 @@ def should_serialize_key(key: str, value: str) -> bool:
             return False
 
     # Throw out environment variables if MACRO_INCLUDE_ENV is unset:
-    if not settings.MACRO_INCLUDE_ENV and key in os.environ:
-        return False
+    if not settings.MACRO_INCLUDE_ENV:
+        if environment_keys is None:
+            environment_keys = os.environ
+        if key in environment_keys:
+            return False
 
     # Bad key or one that matches regular expressions in RE_MACRO_KEY_SKIP
     # (by way of 'WHATRECORD_MACRO_KEY_SKIP')
     if not key:
         return False
-    return not any(regex.fullmatch(key) for regex in RE_MACRO_KEY_SKIP)
+    skip = _get_macro_key_skip()
+    return skip is None or skip.fullmatch(key) is None
 
 
 @apischema.serializer
 def _serialize_macro_context(ctx: MacroContext) -> Dict[str, Any]:
+    # There is no bulk accessor for the expanded macros; dict() is quicker than
+    # iterating ctx.items() as it looks up each value without the views
+    all_macros = dict(ctx)
+    # os.environ lookups encode the key each time; check a snapshot instead
+    environment_keys = (
+        frozenset() if settings.MACRO_INCLUDE_ENV else frozenset(os.environ)
+    )
     macros = {
         key: value
-        for key, value in ctx.items()
-        if should_serialize_key(key, value)
+        for key, value in all_macros.items()
+        if should_serialize_key(key, value, environment_keys=environment_keys)
     }
 
     return apischema.serialize(
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import contextlib
+import copy
 import functools
+import hashlib
 import logging
 import os
 import pathlib
+import re
+import shlex
+import selectors
 import shutil
+import signal
 import subprocess
-import textwrap
+import tempfile
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import (TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set,
+                    Tuple, Union)
 
 import apischema
-import graphviz as gv
 
+from . import settings
+from .cache import Cached, CacheKey
 from .common import AnyPath
 from .graph import _GraphHelper
-from .util import lines_between
+
+if TYPE_CHECKING:
+    import graphviz as gv
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +43,33 @@ class MakeNotInstalled(RuntimeError):
 
 _section_start_marker = "--whatrecord-section-start--"
 _section_end_marker = "--whatrecord-section-end--"
+# Sections holding make's own information; see ``Makefile._get_make_vars``:
+_make_var_sections = ("default_goal", "makefile_list", "make_features", "include_dirs")
+# Makefile lines which may lead to RELEASE_TOPS being defined:
+_may_define_release_tops_re = re.compile(
+    r"^\s*-?s?include\b|RELEASE_TOPS", re.MULTILINE
+)
+# Release variable values starting with these look like paths:
+_path_like_prefixes = ("/", "\\", "../", "..\\")
+# Per-Makefile markers for ``Makefile.from_files``:
+_file_start_marker = "--whatrecord-file-start--"
+_file_end_marker = "--whatrecord-file-end--"
+# End of a ``_MakeWorker`` response:
+_worker_done_marker = "--whatrecord-worker-done--"
 _whatrecord_target = "_whatrecord_target"
+# Set (with ``full_env=False``) to only output the following variables and
+# those named in RELEASE_TOPS, rather than the full environment:
+_minimal_env_variable = "_WHATRECORD_MINIMAL_ENV_"
+_minimal_env_variables = " ".join(
+    (
+        "BASE_MODULE_VERSION",
+        "BUILD_ARCHS",
+        "CONFIG",
+        "CROSS_COMPILER_HOST_ARCHS",
+        "CROSS_COMPILER_TARGET_ARCHS",
+        "RELEASE_TOPS",
+    )
+)
 
 _make_helper: str = fr"""
 
@@ -37,31 +80,637 @@ _make_helper: str = fr"""
 #   tells make to export all variables to child processes by default. See
 #   Communicating Variables to a Sub-make.
 
+# The make meta information sections, as specified by make itself, are
+# printed by make with $(info).  make expands all lines of a recipe before
+# running any, so these come first, without starting a shell for each line.
+# Then the environment section; null-delimited list of env vars.  This is the
+# only command run and the last section, extending to the end of the output.
+# Alternatively, the variables section has only the variables that are used,
+# one per line, and is printed by make.
+ifdef {_minimal_env_variable}
+_whatrecord_variables = $(foreach var,{_minimal_env_variables} $(RELEASE_TOPS),\
+    $(if $(filter undefined,$(origin $(var))),,$(info $(var)=$($(var)))))
+endif
+
 {_whatrecord_target}:
-    # This is the environment section; null-delimited list of env vars
-    @echo "{_section_start_marker}env"
+    $(info {_section_start_marker}default_goal)
+    $(info $(.DEFAULT_GOAL))
+    $(info {_section_end_marker})
+    $(info {_section_start_marker}makefile_list)
+    $(info $(MAKEFILE_LIST))
+    $(info {_section_end_marker})
+    $(info {_section_start_marker}make_features)
+    $(info $(.FEATURES))
+    $(info {_section_end_marker})
+    $(info {_section_start_marker}include_dirs)
+    $(info $(.INCLUDE_DIRS))
+    $(info {_section_end_marker})
+ifdef {_minimal_env_variable}
+    $(info {_section_start_marker}variables)
+    $(_whatrecord_variables)
+else
+    $(info {_section_start_marker}env)
     @env -0
-    @echo "{_section_end_marker}"
-    # This is the make meta information section, as specified by make itself
-    @echo "{_section_start_marker}default_goal"
-    @echo "$(.DEFAULT_GOAL)"
-    @echo "{_section_end_marker}"
-    @echo "{_section_start_marker}makefile_list"
-    @echo "$(MAKEFILE_LIST)"
-    @echo "{_section_end_marker}"
-    @echo "{_section_start_marker}make_features"
-    @echo "$(.FEATURES)"
-    @echo "{_section_end_marker}"
-    @echo "{_section_start_marker}include_dirs"
-    @echo "$(.INCLUDE_DIRS)"
-    @echo "{_section_end_marker}"
+endif
 """.replace("    ", "\t")
+# For debug logging:
+_make_helper_display = _make_helper.replace("\t", "(tab) ")
+
+
+@functools.lru_cache(maxsize=None)
+def _encode_make_helper(encoding: str) -> bytes:
+    """The make helper to append to a makefile, encoded once per encoding."""
+    return ("\n" + _make_helper).encode(encoding)
+
+
+# The environment variable used to share the ``make`` path with subprocesses:
+_make_path_variable = "_WHATRECORD_MAKE_PATH"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_make_path() -> Optional[str]:
+    """
+    Get the absolute path to ``make``, if available.
+
+    This is shared with subprocesses (and forked processes) by way of the
+    environment, such that they need not search ``PATH`` again.
+    """
+    path = os.environ.get(_make_path_variable, None)
+    if path is not None and (not path or os.access(path, os.X_OK)):
+        return path or None
+
+    path = shutil.which("make")
+    os.environ[_make_path_variable] = path or ""
+    return path
 
 
 @functools.lru_cache(maxsize=None)
 def host_has_make() -> bool:
     """Does the host have ``make`` required to use this module?"""
-    return shutil.which("make") is not None
+    return _get_make_path() is not None
+
+
+def _get_make_variable_args(variables: Optional[Dict[str, str]]) -> List[str]:
+    """Get ``make`` command-line arguments to define ``variables``."""
+    custom_defines = dict(variables or {})
+    custom_defines["_DEPENDENCY_CHECK_"] = "1"
+    return [
+        f"{variable}={value}"
+        for variable, value in custom_defines.items()
+    ]
+
+
+def _indent(text: str, prefix: str = "    ") -> str:
+    """Indent (debug) output; cheaper than ``textwrap.indent`` on large output."""
+    return prefix + text.replace("\n", "\n" + prefix)
+
+
+def _split_or_empty(value: Optional[str]) -> List[str]:
+    """Split a whitespace-delimited value, only if it is set and non-empty."""
+    # A new list each time, as Makefile fields may be modified
+    return value.split() if value else []
+
+
+def _get_env_variables(
+    variables: Optional[Dict[str, str]], full_env: bool
+) -> Optional[Dict[str, str]]:
+    """Variables to pass to ``make``, given the ``full_env`` setting."""
+    if full_env:
+        return variables
+    return {**(variables or {}), _minimal_env_variable: "1"}
+
+
+def _get_make_stdin_command(variables: Optional[Dict[str, str]]) -> List[str]:
+    """The ``make`` command to evaluate a Makefile (and helper) from stdin."""
+    return [
+        _get_make_path(),
+        "--silent",
+        "--keep-going",
+        "--file=-",
+        _whatrecord_target,
+        *_get_make_variable_args(variables),
+    ]
+
+
+def _get_make_file_command(
+    filename: pathlib.Path,
+    helper_path: str,
+    variables: Optional[Dict[str, str]],
+) -> List[str]:
+    """The ``make`` command to evaluate a Makefile (and helper) by path."""
+    return [
+        _get_make_path(),
+        "--silent",
+        "--keep-going",
+        f"--file={filename}",
+        f"--file={helper_path}",
+        _whatrecord_target,
+        *_get_make_variable_args(variables),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _write_make_helper(encoding: str) -> str:
+    """Write the make helper to a file, removed when Python exits."""
+    temp_dir = tempfile.TemporaryDirectory()
+    atexit.register(temp_dir.cleanup)
+    helper_path = os.path.join(temp_dir.name, "whatrecord.mk")
+    with open(helper_path, "wb") as fp:
+        fp.write(_make_helper.encode(encoding))
+    return helper_path
+
+
+def _get_make_helper_path(encoding: str = "utf-8") -> str:
+    """
+    Path to the make helper, for use with ``make --file``.
+
+    The helper is written once per process (and encoding), and shared by all
+    users.  It is written again should it be removed while in use, as by a
+    temporary file cleaner in a long-lived process.
+    """
+    helper_path = _write_make_helper(encoding)
+    if not os.path.exists(helper_path):
+        _write_make_helper.cache_clear()
+        helper_path = _write_make_helper(encoding)
+    return helper_path
+
+
+def _get_make_env(working_directory: AnyPath) -> Dict[str, str]:
+    """The environment to run ``make`` with, from ``working_directory``."""
+    env = dict(os.environ)
+    # Shell updates this variable and Makefiles may rely on it:
+    env["PWD"] = str(working_directory)
+    return env
+
+
+@dataclass
+class _MakeInvocation:
+    """
+    How to run ``make`` for a single Makefile.
+
+    This is shared by the blocking and asyncio code paths, which differ only
+    in how the command is run.
+    """
+    #: The ``make`` command line.
+    args: List[str]
+    #: The working directory to run ``make`` in.
+    working_directory: AnyPath
+    #: The resolved Makefile path, if ``make`` reads the Makefile itself.
+    path: Optional[pathlib.Path] = None
+    #: The make helper file, if ``make`` reads the Makefile itself.
+    helper_path: Optional[str] = None
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """The environment to run ``make`` with."""
+        return _get_make_env(self.working_directory)
+
+    @classmethod
+    def for_contents(
+        cls,
+        contents: bytes,
+        filename: Optional[AnyPath] = None,
+        working_directory: Optional[AnyPath] = None,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+    ) -> _MakeInvocation:
+        """Evaluate Makefile ``contents`` (and the helper) from stdin."""
+        if not host_has_make():
+            raise MakeNotInstalled("Host does not have ``make`` installed.")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "New makefile contents: %s\n%s",
+                contents.decode(encoding, "replace").replace("\t", "(tab) "),
+                _make_helper_display,
+            )
+
+        if working_directory is None:
+            if filename is not None:
+                working_directory = pathlib.Path(filename).resolve().parent
+            else:
+                working_directory = pathlib.Path.cwd()
+
+        return cls(
+            args=_get_make_stdin_command(variables),
+            working_directory=working_directory,
+        )
+
+    @classmethod
+    def for_file(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath] = None,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+    ) -> _MakeInvocation:
+        """Evaluate the Makefile ``filename``, with ``make`` reading it itself."""
+        if not host_has_make():
+            raise MakeNotInstalled("Host does not have ``make`` installed.")
+
+        path = pathlib.Path(filename).resolve()
+        if working_directory is None:
+            working_directory = path.parent
+        # make reads the file itself, rather than it being read here and piped
+        # to make along with the helper:
+        helper_path = _get_make_helper_path(encoding)
+        return cls(
+            args=_get_make_file_command(path, helper_path, variables),
+            working_directory=working_directory,
+            path=path,
+            helper_path=helper_path,
+        )
+
+    def log_output(self, output: str, stderr: str) -> None:
+        """Log ``make`` output, for debugging."""
+        logger.debug(
+            "make output for %s:\n%s\nmake stderr:\n%s",
+            self.path or "makefile contents",
+            _indent(output),
+            _indent(stderr),
+        )
+
+
+class _MakeWorker:
+    """
+    A long-lived shell which evaluates Makefiles on request.
+
+    Each request still runs ``make``, but from this shell rather than as a new
+    subprocess of this (potentially large) Python process.  The shell inherits
+    the environment at the time it was started, so it is restarted should
+    ``os.environ`` change.  It is also restarted should it exit, or should a
+    request take longer than ``settings.MAKE_WORKER_TIMEOUT`` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proc = None
+        self._env = None
+
+    def _start(self) -> subprocess.Popen:
+        """Start the shell, if not already running with the current environment."""
+        env = dict(os.environ)
+        if self._proc is not None and (
+            self._proc.poll() is not None or env != self._env
+        ):
+            self._stop()
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                ["sh"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                # Such that make is stopped along with the shell:
+                start_new_session=True,
+            )
+            self._env = env
+        return self._proc
+
+    def _stop(self):
+        """Stop the shell and anything it is running, without waiting for it."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        with contextlib.suppress(OSError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+
+    def _read_response(self, proc: subprocess.Popen, done_marker: bytes) -> bytes:
+        """Read the shell output up to ``done_marker``, within the timeout."""
+        timeout = settings.MAKE_WORKER_TIMEOUT
+        deadline = time.monotonic() + timeout
+        # Read the pipe directly; ``proc.stdout`` buffering would hide data
+        # from the selector:
+        fd = proc.stdout.fileno()
+        response = bytearray()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not response.endswith(done_marker):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise subprocess.TimeoutExpired(["make"], timeout)
+                data = os.read(fd, 65536)
+                if not data:
+                    raise EOFError("make worker shell exited unexpectedly")
+                response += data
+        return bytes(response[:-len(done_marker)])
+
+    def evaluate(
+        self,
+        filename: pathlib.Path,
+        working_directory: pathlib.Path,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        capture_stderr: bool = False,
+    ) -> Tuple[str, str]:
+        """
+        Run ``make`` with our helper target on ``filename``.
+
+        Returns
+        -------
+        output : str
+            The ``make`` output.
+
+        stderr : str
+            The ``make`` standard error output, if ``capture_stderr`` is set.
+        """
+        helper_path = _get_make_helper_path(encoding)
+        custom_args = " ".join(
+            shlex.quote(arg) for arg in _get_make_variable_args(variables)
+        )
+        make = shlex.quote(_get_make_path())
+        stderr_path = os.path.join(os.path.dirname(helper_path), "worker.stderr")
+        # ``cd`` sets PWD, which Makefiles may rely on:
+        command = (
+            f"(cd {shlex.quote(str(working_directory))} && "
+            f"{make} --silent --keep-going "
+            f"--file={shlex.quote(str(filename))} "
+            f"--file={shlex.quote(helper_path)} "
+            f"{_whatrecord_target} {custom_args}) < /dev/null "
+            f"2> {shlex.quote(stderr_path) if capture_stderr else '/dev/null'}; "
+            f"echo; echo '{_worker_done_marker}'\n"
+        ).encode(encoding)
+        done_marker = f"\n{_worker_done_marker}\n".encode(encoding)
+        with self._lock:
+            try:
+                proc = self._start()
+                try:
+                    proc.stdin.write(command)
+                    proc.stdin.flush()
+                    response = self._read_response(proc, done_marker)
+                except (BrokenPipeError, EOFError):
+                    # The shell exited; try once more with a new one
+                    self._stop()
+                    proc = self._start()
+                    proc.stdin.write(command)
+                    proc.stdin.flush()
+                    response = self._read_response(proc, done_marker)
+            except BaseException:
+                # Including a timeout: the shell state is unknown, start anew
+                # with the next request
+                self._stop()
+                raise
+
+            stderr = ""
+            if capture_stderr:
+                with open(stderr_path, "rb") as fp:
+                    stderr = fp.read().decode(encoding, "replace")
+
+        return response.decode(encoding, "replace"), stderr
+
+    def close(self):
+        """Stop the shell."""
+        with self._lock:
+            if self._proc is not None:
+                self._proc.stdin.close()
+                self._proc.wait()
+                self._proc.stdout.close()
+                self._proc = None
+
+
+_make_worker: Optional[_MakeWorker] = None
+
+
+def _get_make_worker() -> _MakeWorker:
+    """Get the shared ``_MakeWorker``, stopped when Python exits."""
+    global _make_worker
+    if _make_worker is None:
+        _make_worker = _MakeWorker()
+        atexit.register(_make_worker.close)
+    return _make_worker
+
+
+# Makefile.from_file arguments to (modification times of the files read,
+# Makefile); see ``_get_cached_makefile``
+_makefile_cache: Dict[Tuple[Any, ...], Tuple[tuple, Makefile]] = {}
+_MAKEFILE_CACHE_SIZE = 512
+
+
+def clear_makefile_cache() -> None:
+    """
+    Clear the ``Makefile.from_file`` cache, enabled by ``WHATRECORD_MAKEFILE_CACHE``.
+
+    Cached Makefiles are reloaded should any of the files they read change,
+    or should the environment change.  Files which did not exist - such as
+    those in an optional ``-include`` - are not tracked, however.  Clear the
+    cache after creating one.
+
+    Makefiles saved in ``WHATRECORD_CACHE_PATH`` are removed as well.
+    """
+    _makefile_cache.clear()
+    cache_path = _CachedMakefile._cache_path_
+    if cache_path is not None:
+        pattern = f"{_CachedMakefile.__name__}_v{_CachedMakefile._cache_version_}_*"
+        for path in cache_path.glob(pattern):
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+
+def _get_environment_fingerprint() -> str:
+    """
+    A fingerprint of ``os.environ``, which ``make`` is run with.
+
+    Unlike ``hash()``, this is the same across processes, such that it may be
+    used in the ``WHATRECORD_CACHE_PATH`` cache key.
+    """
+    sha = hashlib.sha256()
+    for key, value in sorted(os.environ.items()):
+        sha.update(f"{key}={value}\0".encode("utf-8", "surrogateescape"))
+    return sha.hexdigest()
+
+
+def _get_makefile_mtimes(
+    filename: pathlib.Path, makefile: Makefile
+) -> Tuple[Optional[int], ...]:
+    """Modification times of ``filename`` and the makefiles it included."""
+    mtimes = []
+    for fn in (filename, *makefile.makefile_list):
+        try:
+            mtimes.append(os.stat(makefile.working_directory / fn).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _get_cached_makefile(
+    cache_key: Tuple[Any, ...], filename: AnyPath
+) -> Optional[Makefile]:
+    """
+    Get a copy of a cached Makefile, if none of the files it read changed.
+
+    ``cache_key`` starts with the resolved Makefile path.
+    """
+    if not settings.MAKEFILE_CACHE:
+        return None
+
+    cached = _makefile_cache.get(cache_key, None)
+    if cached is None:
+        cached = _load_cached_makefile(cache_key)
+        if cached is None:
+            return None
+        _add_to_makefile_cache(cache_key, cached)
+
+    mtimes, makefile = cached
+    if mtimes != _get_makefile_mtimes(cache_key[0], makefile):
+        _makefile_cache.pop(cache_key, None)
+        return None
+
+    makefile = copy.deepcopy(makefile)
+    makefile.filename = pathlib.Path(filename)
+    return makefile
+
+
+def _add_to_makefile_cache(
+    cache_key: Tuple[Any, ...], cached: Tuple[tuple, Makefile]
+) -> None:
+    """Add an entry to the in-memory Makefile cache."""
+    if len(_makefile_cache) >= _MAKEFILE_CACHE_SIZE:
+        _makefile_cache.clear()
+    _makefile_cache[cache_key] = cached
+
+
+def _cache_makefile(cache_key: Tuple[Any, ...], makefile: Makefile) -> None:
+    """Cache a copy of ``makefile``; see ``_get_cached_makefile``."""
+    if not settings.MAKEFILE_CACHE:
+        return
+
+    mtimes = _get_makefile_mtimes(cache_key[0], makefile)
+    _add_to_makefile_cache(cache_key, (mtimes, copy.deepcopy(makefile)))
+    _save_cached_makefile(cache_key, mtimes, makefile)
+
+
+def _get_persistent_cache_key(
+    cache_key: Tuple[Any, ...]
+) -> Optional[_MakefileCacheKey]:
+    """The ``WHATRECORD_CACHE_PATH`` key for a ``from_file`` cache key."""
+    (
+        filename, working_directory, keep_os_env, variables, encoding, cls,
+        environment,
+    ) = cache_key
+    if _CachedMakefile._cache_path_ is None or cls is not Makefile:
+        return None
+    return _MakefileCacheKey(
+        filename=str(filename),
+        working_directory=working_directory,
+        keep_os_env=keep_os_env,
+        variables=dict(variables),
+        encoding=encoding,
+        environment=environment,
+    )
+
+
+def _load_cached_makefile(
+    cache_key: Tuple[Any, ...]
+) -> Optional[Tuple[tuple, Makefile]]:
+    """Load (mtimes, Makefile) from ``WHATRECORD_CACHE_PATH``, if enabled."""
+    key = _get_persistent_cache_key(cache_key)
+    if key is None:
+        return None
+    cached = _CachedMakefile.from_cache(key)
+    if cached is None:
+        return None
+    return tuple(cached.mtimes), cached.makefile
+
+
+def _save_cached_makefile(
+    cache_key: Tuple[Any, ...], mtimes: tuple, makefile: Makefile
+) -> None:
+    """Save a Makefile to ``WHATRECORD_CACHE_PATH``, if enabled."""
+    key = _get_persistent_cache_key(cache_key)
+    if key is not None:
+        _CachedMakefile(key=key, mtimes=list(mtimes), makefile=makefile).save_to_cache()
+
+
+def _run_make_script(
+    filenames: List[pathlib.Path],
+    script_path: str,
+    helper_path: str,
+    variables: Optional[Dict[str, str]] = None,
+    encoding: str = "utf-8",
+) -> List[str]:
+    """
+    Run ``make`` on each of ``filenames`` with the helper, from a single shell
+    script, and get the output for each.
+    """
+    custom_args = " ".join(
+        shlex.quote(arg) for arg in _get_make_variable_args(variables)
+    )
+    make = shlex.quote(_get_make_path())
+    script = []
+    for idx, filename in enumerate(filenames):
+        path = filename.resolve()
+        # ``cd`` sets PWD, which Makefiles may rely on:
+        script.extend(
+            (
+                f"echo '{_file_start_marker}{idx}'",
+                f"(cd {shlex.quote(str(path.parent))} && "
+                f"{make} --silent --keep-going "
+                f"--file={shlex.quote(str(path))} "
+                f"--file={shlex.quote(helper_path)} "
+                f"{_whatrecord_target} {custom_args})",
+                f"echo '{_file_end_marker}'",
+            )
+        )
+
+    with open(script_path, "wt", encoding=encoding) as fp:
+        fp.write("\n".join(script))
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    # With stdout as the only pipe, it is read directly rather than polling
+    # stdout and stderr together; stderr is only needed for debugging.
+    result = subprocess.run(
+        ["sh", script_path],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if debug else subprocess.DEVNULL,
+    )
+
+    stdout = result.stdout.decode(encoding, "replace")
+    if debug:
+        stderr = result.stderr.decode(encoding, "replace")
+        logger.debug(
+            "make output:\n%s\nmake stderr:\n%s",
+            _indent(stdout),
+            _indent(stderr),
+        )
+
+    outputs = []
+    for idx in range(len(filenames)):
+        start_marker = f"{_file_start_marker}{idx}\n"
+        start = stdout.find(start_marker)
+        if start == -1:
+            outputs.append("")
+            continue
+
+        start += len(start_marker)
+        end = stdout.find(_file_end_marker, start)
+        outputs.append(stdout[start:end] if end != -1 else stdout[start:])
+    return outputs
+
+
+def _may_define_release_tops(
+    filename: AnyPath,
+    variables: Optional[Dict[str, str]] = None,
+    encoding: str = "utf-8",
+) -> bool:
+    """
+    Could ``make`` find RELEASE_TOPS in the given Makefile?
+
+    That is, does it include other files (such as ``configure/CONFIG``) or
+    mention RELEASE_TOPS itself, or is it set outside of the Makefile.
+    """
+    if "RELEASE_TOPS" in os.environ or "RELEASE_TOPS" in (variables or {}):
+        return True
+    try:
+        with open(filename, "rt", encoding=encoding, errors="replace") as fp:
+            contents = fp.read()
+    except OSError:
+        # Let ``make`` report on it
+        return True
+    return _may_define_release_tops_re.search(contents) is not None
 
 
 @dataclass
@@ -132,70 +781,78 @@ class Makefile:
         # ``path/Makefile`` check is sufficient for the build system.
         valid_paths = {}
         invalid_paths = {}
+        env_get = self.env.get
+        working_directory = str(self.working_directory)
         for var in self.release_top_vars:
-            value = self.env.get(var, "").strip()
+            value = env_get(var, "").strip()
             if not value:
                 continue
 
             # Assume it's not for windows, for now.  Can't instantiate
-            # WindowsPath on linux anyway:
+            # WindowsPath on linux anyway.  os.path avoids creating
+            # intermediate Path instances for each check:
             try:
-                path = (self.working_directory / value).resolve()
-                if (path / "Makefile").is_file():
-                    valid_paths[var] = path
-                elif any(
-                    (
-                        value.startswith("/"),
-                        value.startswith("\\"),
-                        value.startswith("../"),
-                        value.startswith("..\\"),
-                    )
-                ):
+                path = os.path.realpath(os.path.join(working_directory, value))
+                if os.path.isfile(os.path.join(path, "Makefile")):
+                    valid_paths[var] = pathlib.Path(path)
+                elif value.startswith(_path_like_prefixes):
                     # Only mark up invalid values that _look_ like either
                     # relative or absolute paths
-                    invalid_paths[var] = path
+                    invalid_paths[var] = pathlib.Path(path)
             except Exception:
                 ...
 
         return valid_paths, invalid_paths
 
     @classmethod
-    def _get_section(cls, output: str, section: str) -> str:
-        """Get a single make output section."""
-        return "\n".join(
-            lines_between(
-                output,
-                start_marker=_section_start_marker + section,
-                end_marker=_section_end_marker,
-                include_blank=False,
-            )
-        ).strip()
+    def _split_sections(cls, output: str) -> Dict[str, str]:
+        """Split make output into its sections, in a single pass."""
+        # str.find is much quicker than a non-greedy regular expression over
+        # the (large) environment section
+        sections = {}
+        find = output.find
+        start = find(_section_start_marker)
+        while start != -1:
+            name_start = start + len(_section_start_marker)
+            name_end = find("\n", name_start)
+            if name_end == -1:
+                break
+            end = find(_section_end_marker, name_end)
+            if end == -1:
+                # The final (env) section has no end marker
+                sections[output[name_start:name_end]] = output[name_end + 1:].strip()
+                break
+            sections[output[name_start:name_end]] = output[name_end + 1:end].strip()
+            start = find(_section_start_marker, end + len(_section_end_marker))
+        return sections
 
     @classmethod
-    def _get_env(cls, output: str, keep_os_env: bool = False) -> Dict[str, str]:
-        """Get environment variables from make output."""
+    def _get_env(
+        cls, sections: Dict[str, str], keep_os_env: bool = False
+    ) -> Dict[str, str]:
+        """Get environment variables from make output sections."""
         env = {}
-        for line in sorted(cls._get_section(output, "env").split("\0")):
-            if "=" in line:
-                variable, value = line.split("=", 1)
-                if not keep_os_env and os.environ.get(variable) == value:
-                    ...
-                else:
-                    env[variable] = value
+        if "variables" in sections:
+            # Only select variables, with ``full_env=False``
+            entries = sections["variables"].splitlines()
+        else:
+            entries = sections.get("env", "").split("\0")
+        if not keep_os_env:
+            # Skip entries unchanged from os.environ before parsing them.  One
+            # pass over os.environ is much quicker than a lookup per entry, as
+            # each lookup encodes the key and decodes the value.
+            os_env = {f"{key}={value}" for key, value in os.environ.items()}
+            entries = [line for line in entries if line not in os_env]
+        for line in entries:
+            variable, equals, value = line.partition("=")
+            if equals:
+                env[variable] = value
         return env
 
     @classmethod
-    def _get_make_vars(cls, output: str) -> Dict[str, str]:
-        """Get environment variables from make output."""
-        makevars = {
-            var: cls._get_section(output, var)
-            for var in (
-                "default_goal",
-                "makefile_list",
-                "make_features",
-                "include_dirs",
-            )
-        }
+    def _get_make_vars(cls, sections: Dict[str, str]) -> Dict[str, str]:
+        """Get make variables from make output sections."""
+        makevars = {var: sections.get(var, "") for var in _make_var_sections}
 
         if makevars.get("default_goal", None) == _whatrecord_target:
             # This means there's no default goal, and ours is the first
@@ -210,31 +867,162 @@ class Makefile:
         working_directory: AnyPath,
         filename: Optional[AnyPath] = None,
         keep_os_env: bool = False,
+        helper_filename: Optional[str] = None,
     ) -> Makefile:
         """
         Parse ``make`` output with our helper target attached.
+
+        If the helper was loaded from ``helper_filename``, it is left out of
+        ``makefile_list``.
         """
+        return cls._from_make_sections(
+            cls._split_sections(output),
+            working_directory=working_directory,
+            filename=filename,
+            keep_os_env=keep_os_env,
+            helper_filename=helper_filename,
+        )
+
+    @classmethod
+    def _from_make_sections(
+        cls,
+        sections: Dict[str, str],
+        working_directory: AnyPath,
+        filename: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        helper_filename: Optional[str] = None,
+    ) -> Makefile:
+        """Create a Makefile from sections of ``make`` output."""
         if filename is not None:
             filename = pathlib.Path(filename)
 
-        env = cls._get_env(output, keep_os_env=keep_os_env)
-        make_vars = cls._get_make_vars(output)
+        env = cls._get_env(sections, keep_os_env=keep_os_env)
+        env_get = env.get
+        make_vars = cls._get_make_vars(sections)
+        config = env_get("CONFIG")
         return cls(
             env=env,
             filename=filename,
             default_goal=make_vars.get("default_goal", ""),
-            makefile_list=make_vars.get("makefile_list", "").split(),
-            make_features=set(make_vars.get("make_features", "").split()),
-            include_dirs=make_vars.get("include_dirs", "").split(),
-            build_archs=env.get("BUILD_ARCHS", "").split(),
-            cross_compiler_host_archs=env.get("CROSS_COMPILER_HOST_ARCHS", "").split(),
-            cross_compiler_target_archs=env.get("CROSS_COMPILER_TARGET_ARCHS", "").split(),
-            base_version=env.get("BASE_MODULE_VERSION", ""),
-            base_config_path=pathlib.Path(env["CONFIG"]) if "CONFIG" in env else None,
-            release_top_vars=env.get("RELEASE_TOPS", "").split(),
+            makefile_list=[
+                fn for fn in _split_or_empty(make_vars.get("makefile_list"))
+                if fn != helper_filename
+            ],
+            make_features=set(_split_or_empty(make_vars.get("make_features"))),
+            include_dirs=_split_or_empty(make_vars.get("include_dirs")),
+            build_archs=_split_or_empty(env_get("BUILD_ARCHS")),
+            cross_compiler_host_archs=_split_or_empty(
+                env_get("CROSS_COMPILER_HOST_ARCHS")
+            ),
+            cross_compiler_target_archs=_split_or_empty(
+                env_get("CROSS_COMPILER_TARGET_ARCHS")
+            ),
+            base_version=env_get("BASE_MODULE_VERSION", ""),
+            base_config_path=pathlib.Path(config) if config is not None else None,
+            release_top_vars=_split_or_empty(env_get("RELEASE_TOPS")),
             working_directory=pathlib.Path(working_directory),
         )
 
+    @classmethod
+    def from_bytes(
+        cls,
+        contents: bytes,
+        filename: Optional[AnyPath] = None,
+        working_directory: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+    ) -> Makefile:
+        """
+        Get Makefile information given its encoded contents.
+
+        The contents are passed to ``make`` as-is.
+
+        Parameters
+        ----------
+        contents : bytes
+            The Makefile contents.
+
+        filename : pathlib.Path or str, optional
+            The filename.
+
+        working_directory : pathlib.Path or str, optional
+            The working directory to use when evaluating the Makefile contents.
+            Assumed to be the directory in which the makefile is contained, but
+            this may be overridden.  If the filename is unavailable, the
+            fallback is the current working directory.
+
+        keep_os_env : bool, optional
+            Keep environment variables in ``.env`` from outside of ``make``,
+            as in those present in ``os.environ`` when executing ``make``.
+
+        variables : dict of str to str
+            Variable overrides to pass to ``make``.
+
+        encoding : str, optional
+            String encoding of the contents and of ``make`` output.
+
+        full_env : bool, optional
+            Include the full environment of ``make`` in ``.env``.  If unset,
+            only the variables used for release dependency information (as
+            listed in RELEASE_TOPS) are included, which is quicker.
+
+        Raises
+        ------
+        RuntimeError
+            If unable to run ``make`` and get information.
+
+        Returns
+        -------
+        makefile : Makefile
+            The makefile information.
+        """
+        variables = _get_env_variables(variables, full_env)
+        make = _MakeInvocation.for_contents(
+            contents,
+            filename=filename,
+            working_directory=working_directory,
+            variables=variables,
+            encoding=encoding,
+        )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        with contextlib.ExitStack() as stack:
+            # stderr is only needed for debugging.  Spool it to a file rather
+            # than a pipe that would need to be drained alongside stdout:
+            stderr = (
+                stack.enter_context(tempfile.TemporaryFile())
+                if debug else subprocess.DEVNULL
+            )
+            proc = stack.enter_context(
+                subprocess.Popen(
+                    make.args,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr,
+                    cwd=make.working_directory,
+                    env=make.env,
+                )
+            )
+            # make reads all of its makefile from stdin before running the
+            # helper target, so this will not block on its output:
+            proc.stdin.write(contents)
+            proc.stdin.write(_encode_make_helper(encoding))
+            proc.stdin.close()
+
+            # Reading and decoding the output at once, then splitting it with
+            # str.find, is quicker than parsing it line-by-line as it arrives
+            output = proc.stdout.read().decode(encoding, "replace")
+            proc.wait()
+
+            if debug:
+                stderr.seek(0)
+                make.log_output(output, stderr.read().decode(encoding, "replace"))
+
+        return cls._from_make_output(
+            output, working_directory=make.working_directory, filename=filename
+        )
+
     @classmethod
     def from_string(
         cls,
@@ -244,6 +1032,7 @@ class Makefile:
         keep_os_env: bool = False,
         variables: Optional[Dict[str, str]] = None,
         encoding: str = "utf-8",
+        full_env: bool = True,
     ) -> Makefile:
         """
         Get Makefile information given its contents.
@@ -272,6 +1061,11 @@ class Makefile:
         encoding : str, optional
             String encoding to use.
 
+        full_env : bool, optional
+            Include the full environment of ``make`` in ``.env``.  If unset,
+            only the variables used for release dependency information (as
+            listed in RELEASE_TOPS) are included, which is quicker.
+
         Raises
         ------
         RuntimeError
@@ -282,60 +1076,190 @@ class Makefile:
         makefile : Makefile
             The makefile information.
         """
-        if not host_has_make():
-            raise MakeNotInstalled("Host does not have ``make`` installed.")
+        variables = _get_env_variables(variables, full_env)
+        return cls.from_bytes(
+            contents.encode(encoding),
+            filename=filename,
+            working_directory=working_directory,
+            keep_os_env=keep_os_env,
+            variables=variables,
+            encoding=encoding,
+        )
 
-        full_contents = "\n".join((contents, _make_helper))
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(
-                "New makefile contents: %s",
-                full_contents.replace("\t", "(tab) "),
-            )
+    @classmethod
+    async def from_bytes_async(
+        cls,
+        contents: bytes,
+        filename: Optional[AnyPath] = None,
+        working_directory: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+    ) -> Makefile:
+        """
+        Get Makefile information given its encoded contents, without blocking.
 
-        if working_directory is None:
-            if filename is not None:
-                working_directory = pathlib.Path(filename).resolve().parent
-            else:
-                working_directory = pathlib.Path.cwd()
+        ``make`` is run as an asyncio subprocess, such that many Makefiles may
+        be evaluated concurrently.  See ``from_bytes`` for parameters.
+        """
+        variables = _get_env_variables(variables, full_env)
+        make = _MakeInvocation.for_contents(
+            contents,
+            filename=filename,
+            working_directory=working_directory,
+            variables=variables,
+            encoding=encoding,
+        )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        proc = await asyncio.create_subprocess_exec(
+            *make.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE if debug else asyncio.subprocess.DEVNULL,
+            cwd=make.working_directory,
+            env=make.env,
+        )
+        stdout, stderr = await proc.communicate(
+            contents + _encode_make_helper(encoding)
+        )
+        output = stdout.decode(encoding, "replace")
+        if debug:
+            make.log_output(output, stderr.decode(encoding, "replace"))
 
-        env = dict(os.environ)
-        # Shell updates this variable and Makefiles may rely on it:
-        env["PWD"] = str(working_directory)
-
-        custom_defines = dict(variables or {})
-        custom_defines["_DEPENDENCY_CHECK_"] = "1"
-        custom_args = [
-            f"{variable}={value}"
-            for variable, value in custom_defines.items()
-        ]
-
-        result = subprocess.run(
-            [
-                "make",
-                "--silent",
-                "--keep-going",
-                "--file=-",
-                _whatrecord_target,
-                *custom_args,
-            ],
-            input=full_contents.encode(encoding),
-            cwd=working_directory,
-            capture_output=True,
-            env=env,
+        return cls._from_make_output(
+            output, working_directory=make.working_directory, filename=filename
         )
-        stdout = result.stdout.decode(encoding, "replace")
-        if logger.isEnabledFor(logging.DEBUG):
-            stderr = result.stderr.decode(encoding, "replace")
-            logger.debug(
-                "make output:\n%s\nmake stderr:\n%s",
-                textwrap.indent(stdout, "    "),
-                textwrap.indent(stderr, "    ")
+
+    @classmethod
+    async def from_string_async(
+        cls,
+        contents: str,
+        filename: Optional[AnyPath] = None,
+        working_directory: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+    ) -> Makefile:
+        """``from_string``, without blocking; see ``from_bytes_async``."""
+        variables = _get_env_variables(variables, full_env)
+        return await cls.from_bytes_async(
+            contents.encode(encoding),
+            filename=filename,
+            working_directory=working_directory,
+            keep_os_env=keep_os_env,
+            variables=variables,
+            encoding=encoding,
+        )
+
+    @classmethod
+    async def from_file_async(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+        fast: bool = False,
+    ) -> Makefile:
+        """
+        Load a Makefile from a filename, without blocking.
+
+        See ``from_file`` for parameters.  Results are shared with the
+        ``from_file`` cache.
+        """
+        variables = _get_env_variables(variables, full_env)
+        if fast and not _may_define_release_tops(filename, variables, encoding):
+            return cls._from_file_without_make(filename, working_directory)
+
+        cache_key = cls._get_cache_key(
+            filename, working_directory, keep_os_env, variables, encoding
+        )
+        makefile = _get_cached_makefile(cache_key, filename)
+        if makefile is None:
+            makefile = await cls._from_file_async(
+                filename,
+                working_directory=working_directory,
+                variables=variables,
+                encoding=encoding,
             )
+            _cache_makefile(cache_key, makefile)
+        return makefile
+
+    @classmethod
+    async def _from_file_async(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath] = None,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+    ) -> Makefile:
+        """Load a Makefile from a filename without blocking or caching."""
+        make = _MakeInvocation.for_file(
+            filename,
+            working_directory=working_directory,
+            variables=variables,
+            encoding=encoding,
+        )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        proc = await asyncio.create_subprocess_exec(
+            *make.args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE if debug else asyncio.subprocess.DEVNULL,
+            cwd=make.working_directory,
+            env=make.env,
+        )
+        stdout, stderr = await proc.communicate()
+        output = stdout.decode(encoding, "replace")
+        if debug:
+            make.log_output(output, stderr.decode(encoding, "replace"))
 
         return cls._from_make_output(
-            stdout, working_directory=working_directory, filename=filename
+            output,
+            working_directory=make.working_directory,
+            filename=filename,
+            helper_filename=make.helper_path,
+        )
+
+    @classmethod
+    async def from_files_async(
+        cls,
+        filenames: Sequence[AnyPath],
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+        fast: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[pathlib.Path, Makefile]:
+        """
+        Load many Makefiles concurrently, without blocking.
+
+        See ``from_files`` for parameters.  Up to ``max_concurrency`` (by
+        default, twice the number of CPUs) ``make`` processes are run at once.
+        """
+        variables = _get_env_variables(variables, full_env)
+        semaphore = asyncio.Semaphore(
+            max_concurrency or (os.cpu_count() or 1) * 2
         )
 
+        async def load(filename: pathlib.Path) -> Makefile:
+            async with semaphore:
+                return await cls.from_file_async(
+                    filename,
+                    keep_os_env=keep_os_env,
+                    variables=variables,
+                    encoding=encoding,
+                    fast=fast,
+                )
+
+        filenames = [pathlib.Path(filename) for filename in filenames]
+        loaded = await asyncio.gather(*(load(filename) for filename in filenames))
+        return dict(zip(filenames, loaded))
+
     @classmethod
     def from_file_obj(
         cls,
@@ -345,6 +1269,7 @@ class Makefile:
         keep_os_env: bool = False,
         variables: Optional[Dict[str, str]] = None,
         encoding: str = "utf-8",
+        full_env: bool = True,
     ) -> Makefile:
         """
         Load a Makefile from a file object.
@@ -352,7 +1277,7 @@ class Makefile:
         Parameters
         ----------
         fp : file-like object
-            The file-like object to read from.
+            The file-like object to read from, in text or binary mode.
 
         filename : pathlib.Path or str, optional
             The filename, defaults to ``fp.name`` if available.
@@ -373,6 +1298,11 @@ class Makefile:
         encoding : str, optional
             String encoding to use.
 
+        full_env : bool, optional
+            Include the full environment of ``make`` in ``.env``.  If unset,
+            only the variables used for release dependency information (as
+            listed in RELEASE_TOPS) are included, which is quicker.
+
         Raises
         ------
         RuntimeError
@@ -383,8 +1313,12 @@ class Makefile:
         makefile : Makefile
             The makefile information.
         """
-        return cls.from_string(
-            fp.read(),
+        variables = _get_env_variables(variables, full_env)
+        contents = fp.read()
+        if isinstance(contents, str):
+            contents = contents.encode(encoding)
+        return cls.from_bytes(
+            contents,
             filename=filename or getattr(fp, "name", None),
             working_directory=working_directory,
             encoding=encoding,
@@ -400,6 +1334,8 @@ class Makefile:
         keep_os_env: bool = False,
         variables: Optional[Dict[str, str]] = None,
         encoding: str = "utf-8",
+        full_env: bool = True,
+        fast: bool = False,
     ) -> Makefile:
         """
         Load a Makefile from a filename.
@@ -424,6 +1360,17 @@ class Makefile:
         encoding : str, optional
             String encoding to use.
 
+        fast : bool, optional
+            Skip running ``make`` for Makefiles that include no other files
+            and do not mention ``RELEASE_TOPS``, returning a Makefile with
+            only its filename set.  Such Makefiles cannot have any release
+            dependencies, making this suitable for dependency scanning.
+
+        full_env : bool, optional
+            Include the full environment of ``make`` in ``.env``.  If unset,
+            only the variables used for release dependency information (as
+            listed in RELEASE_TOPS) are included, which is quicker.
+
         Raises
         ------
         RuntimeError
@@ -434,16 +1381,248 @@ class Makefile:
         makefile : Makefile
             The makefile information.
         """
-        with open(filename, "rt") as fp:
-            contents = fp.read()
-        return cls.from_string(
-            contents,
-            filename=filename,
+        variables = _get_env_variables(variables, full_env)
+        if fast and not _may_define_release_tops(filename, variables, encoding):
+            return cls._from_file_without_make(filename, working_directory)
+
+        cache_key = cls._get_cache_key(
+            filename, working_directory, keep_os_env, variables, encoding
+        )
+        makefile = _get_cached_makefile(cache_key, filename)
+        if makefile is None:
+            makefile = cls._from_file(
+                filename,
+                working_directory=working_directory,
+                keep_os_env=keep_os_env,
+                variables=variables,
+                encoding=encoding,
+            )
+            _cache_makefile(cache_key, makefile)
+        return makefile
+
+    @classmethod
+    def _from_file_without_make(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath] = None,
+    ) -> Makefile:
+        """A Makefile with only filename information; see ``fast``."""
+        if working_directory is None:
+            working_directory = pathlib.Path(filename).resolve().parent
+        return cls(
+            filename=pathlib.Path(filename),
+            working_directory=pathlib.Path(working_directory),
+        )
+
+    @classmethod
+    def _get_cache_key(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath],
+        keep_os_env: bool,
+        variables: Optional[Dict[str, str]],
+        encoding: str,
+    ) -> Tuple[Any, ...]:
+        """Cache key for ``from_file`` arguments and the environment."""
+        return (
+            pathlib.Path(filename).resolve(),
+            str(working_directory) if working_directory is not None else None,
+            keep_os_env,
+            tuple(sorted((variables or {}).items())),
+            encoding,
+            cls,
+            _get_environment_fingerprint(),
+        )
+
+    @classmethod
+    def _from_file(
+        cls,
+        filename: AnyPath,
+        working_directory: Optional[AnyPath] = None,
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+    ) -> Makefile:
+        """Load a Makefile from a filename, without caching."""
+        make = _MakeInvocation.for_file(
+            filename,
             working_directory=working_directory,
-            encoding=encoding,
-            keep_os_env=keep_os_env,
             variables=variables,
+            encoding=encoding,
         )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if settings.MAKE_WORKER:
+            output, stderr = _get_make_worker().evaluate(
+                make.path,
+                working_directory=pathlib.Path(make.working_directory).resolve(),
+                variables=variables,
+                encoding=encoding,
+                capture_stderr=debug,
+            )
+        else:
+            result = subprocess.run(
+                make.args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE if debug else subprocess.DEVNULL,
+                cwd=make.working_directory,
+                env=make.env,
+            )
+            output = result.stdout.decode(encoding, "replace")
+            stderr = result.stderr.decode(encoding, "replace") if debug else ""
+
+        if debug:
+            make.log_output(output, stderr)
+
+        return cls._from_make_output(
+            output,
+            working_directory=make.working_directory,
+            filename=filename,
+            helper_filename=make.helper_path,
+        )
+
+    @classmethod
+    def from_files(
+        cls,
+        filenames: Sequence[AnyPath],
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        full_env: bool = True,
+        fast: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Dict[pathlib.Path, Makefile]:
+        """
+        Load many Makefiles at once.
+
+        Each Makefile is evaluated by its own ``make`` in the directory
+        containing it, as in ``from_file``.  These are run from up to
+        ``max_workers`` shell scripts at once, rather than starting a
+        subprocess per Makefile.
+
+        Parameters
+        ----------
+        filenames : list of pathlib.Path or str
+            The filenames.
+
+        keep_os_env : bool, optional
+            Keep environment variables in ``.env`` from outside of ``make``,
+            as in those present in ``os.environ`` when executing ``make``.
+
+        variables : dict of str to str
+            Variable overrides to pass to ``make``.
+
+        encoding : str, optional
+            String encoding to use.
+
+        fast : bool, optional
+            Skip running ``make`` for Makefiles that include no other files
+            and do not mention ``RELEASE_TOPS``, returning a Makefile with
+            only its filename set.  Such Makefiles cannot have any release
+            dependencies, making this suitable for dependency scanning.
+
+        full_env : bool, optional
+            Include the full environment of ``make`` in ``.env``.  If unset,
+            only the variables used for release dependency information (as
+            listed in RELEASE_TOPS) are included, which is quicker.
+
+        max_workers : int, optional
+            The number of ``make`` processes to run concurrently.  Defaults to
+            the number of CPUs.
+
+        Raises
+        ------
+        RuntimeError
+            If unable to run ``make`` and get information.
+
+        Returns
+        -------
+        makefiles : dict of pathlib.Path to Makefile
+            The makefile information, keyed on filename.
+        """
+        variables = _get_env_variables(variables, full_env)
+        if not host_has_make():
+            raise MakeNotInstalled("Host does not have ``make`` installed.")
+
+        filenames = [pathlib.Path(filename) for filename in filenames]
+
+        makefiles = {}
+        to_load = {}
+        for filename in filenames:
+            if fast and not _may_define_release_tops(
+                filename, variables, encoding
+            ):
+                makefiles[filename] = cls._from_file_without_make(filename)
+                continue
+
+            cache_key = cls._get_cache_key(
+                filename, None, keep_os_env, variables, encoding
+            )
+            makefile = _get_cached_makefile(cache_key, filename)
+            if makefile is None:
+                to_load[filename] = cache_key
+            else:
+                makefiles[filename] = makefile
+
+        if to_load:
+            loaded = cls._from_files(
+                list(to_load),
+                keep_os_env=keep_os_env,
+                variables=variables,
+                encoding=encoding,
+                max_workers=max_workers,
+            )
+            for filename, makefile in loaded.items():
+                _cache_makefile(to_load[filename], makefile)
+                makefiles[filename] = makefile
+
+        return {filename: makefiles[filename] for filename in filenames}
+
+    @classmethod
+    def _from_files(
+        cls,
+        filenames: List[pathlib.Path],
+        keep_os_env: bool = False,
+        variables: Optional[Dict[str, str]] = None,
+        encoding: str = "utf-8",
+        max_workers: Optional[int] = None,
+    ) -> Dict[pathlib.Path, Makefile]:
+        """Load many Makefiles at once, without caching."""
+        num_scripts = max(1, min(max_workers or os.cpu_count() or 1, len(filenames)))
+        batches = [filenames[idx::num_scripts] for idx in range(num_scripts)]
+
+        helper_path = _get_make_helper_path(encoding)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            run_batch = functools.partial(
+                _run_make_script,
+                helper_path=helper_path,
+                variables=variables,
+                encoding=encoding,
+            )
+            script_paths = [
+                os.path.join(temp_dir, f"whatrecord{idx}.sh")
+                for idx in range(num_scripts)
+            ]
+            if num_scripts == 1:
+                outputs = [run_batch(batches[0], script_paths[0])]
+            else:
+                # The work is done by make, so threads suffice to run the
+                # scripts concurrently:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=num_scripts
+                ) as executor:
+                    outputs = list(executor.map(run_batch, batches, script_paths))
+
+        makefiles = {}
+        for batch, batch_outputs in zip(batches, outputs):
+            for filename, output in zip(batch, batch_outputs):
+                makefiles[filename] = cls._from_make_output(
+                    output,
+                    working_directory=filename.resolve().parent,
+                    filename=filename,
+                    helper_filename=helper_path,
+                )
+        return {filename: makefiles[filename] for filename in filenames}
 
     @staticmethod
     def find_makefile(
@@ -476,6 +1655,26 @@ class Makefile:
         return path.resolve()
 
 
+@dataclass
+class _MakefileCacheKey(CacheKey):
+    """``WHATRECORD_CACHE_PATH`` cache key for ``Makefile.from_file``."""
+    filename: str
+    working_directory: Optional[str]
+    keep_os_env: bool
+    variables: Dict[str, str]
+    encoding: str
+    #: Fingerprint of the environment make was run with.
+    environment: str
+
+
+@dataclass
+class _CachedMakefile(Cached, key=_MakefileCacheKey, version=2):
+    """A Makefile persisted in ``WHATRECORD_CACHE_PATH``."""
+    #: Modification times of the Makefile and the makefiles it included.
+    mtimes: List[Optional[int]]
+    makefile: Makefile
+
+
 @dataclass
 class Dependency:
     """A single EPICS dependency (module) in the build system."""
@@ -506,10 +1705,11 @@ class Dependency:
         name: Optional[str] = None,
         variable_name: Optional[str] = None,
         root: Optional[DependencyGroup] = None,
+        fast: bool = False,
     ) -> Dependency:
         if makefile.filename is not None:
-            name = name or makefile.filename.parent.name
             path = makefile.filename.parent
+            name = name or path.name
         else:
             name = name or "unknown"
             path = pathlib.Path(".")  # :shrug:
@@ -532,34 +1732,148 @@ class Dependency:
         if not recurse:
             return this_dep
 
-        valid_paths, invalid_paths = makefile.find_release_paths()
-        for variable_name, path in valid_paths.items():
-            if path in root.all_modules:
-                release_dep = root.all_modules[path]
-            else:
-                try:
-                    dep_makefile_path = Makefile.find_makefile(path)
-                except FileNotFoundError:
-                    this_dep.missing_paths[variable_name] = path
-                    continue
+        # Walk the dependency tree breadth-first, loading the newly-found
+        # dependencies of each level with a single ``Makefile.from_files``:
+        release_deps: Dict[pathlib.Path, Dependency] = {this_dep.path: this_dep}
+        pending = [this_dep]
+        while pending:
+            to_load, links = cls._find_release_dependencies(
+                pending, root, release_deps
+            )
+            # With ``fast``, Makefiles that cannot have further release
+            # dependencies are not evaluated, and the others only include the
+            # release-related variables; see ``Makefile.from_file``
+            makefiles = Makefile.from_files(
+                [makefile_path for _, makefile_path in to_load.values()],
+                keep_os_env=keep_os_env,
+                fast=fast,
+                full_env=not fast,
+            )
+            pending = cls._add_release_dependencies(
+                to_load, links, makefiles, root, release_deps, keep_os_env
+            )
 
-                dep_makefile = Makefile.from_file(
-                    dep_makefile_path, keep_os_env=keep_os_env
-                )
-                release_dep = cls.from_makefile(
-                    dep_makefile,
-                    recurse=True,
-                    keep_os_env=keep_os_env,
-                    name=variable_name,  # unclear the right approach here
-                    variable_name=variable_name,
-                    root=root,
-                )
-            release_dep.dependents[this_dep.variable_name] = this_dep.path
-            this_dep.dependencies[variable_name] = release_dep.path
+        return this_dep
+
+    @classmethod
+    async def from_makefile_async(
+        cls,
+        makefile: Makefile,
+        recurse: bool = True,
+        *,
+        keep_os_env: bool = False,
+        name: Optional[str] = None,
+        variable_name: Optional[str] = None,
+        root: Optional[DependencyGroup] = None,
+        fast: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> Dependency:
+        """
+        ``from_makefile``, evaluating release Makefiles without blocking.
+
+        The Makefiles of each level of the dependency tree are evaluated
+        concurrently, with up to ``max_concurrency`` (by default, twice the
+        number of CPUs) ``make`` processes at once.
+        """
+        this_dep = cls.from_makefile(
+            makefile,
+            recurse=False,
+            keep_os_env=keep_os_env,
+            name=name,
+            variable_name=variable_name,
+            root=root,
+        )
+        if root is None or not recurse:
+            return this_dep
+
+        release_deps: Dict[pathlib.Path, Dependency] = {this_dep.path: this_dep}
+        pending = [this_dep]
+        while pending:
+            to_load, links = cls._find_release_dependencies(
+                pending, root, release_deps
+            )
+            makefiles = await Makefile.from_files_async(
+                [makefile_path for _, makefile_path in to_load.values()],
+                keep_os_env=keep_os_env,
+                fast=fast,
+                full_env=not fast,
+                max_concurrency=max_concurrency,
+            )
+            pending = cls._add_release_dependencies(
+                to_load, links, makefiles, root, release_deps, keep_os_env
+            )
 
-        this_dep.missing_paths = invalid_paths
         return this_dep
 
+    @staticmethod
+    def _find_release_dependencies(
+        pending: List[Dependency],
+        root: DependencyGroup,
+        release_deps: Dict[pathlib.Path, Dependency],
+    ) -> Tuple[
+        Dict[pathlib.Path, Tuple[str, pathlib.Path]],
+        List[Tuple[Dependency, str, pathlib.Path]],
+    ]:
+        """
+        Find the release dependencies of one level of the dependency walk.
+
+        Returns
+        -------
+        to_load : dict of pathlib.Path to (str, pathlib.Path)
+            Newly-found release paths to (variable name, Makefile path).
+
+        links : list of (Dependency, str, pathlib.Path)
+            (dependent, variable name, release path) for each dependency.
+        """
+        to_load: Dict[pathlib.Path, Tuple[str, pathlib.Path]] = {}
+        links: List[Tuple[Dependency, str, pathlib.Path]] = []
+        for dep in pending:
+            valid_paths, invalid_paths = dep.makefile.find_release_paths()
+            dep.missing_paths = invalid_paths
+            for variable_name, path in valid_paths.items():
+                if path not in release_deps and path not in to_load:
+                    if path in root.all_modules:
+                        release_deps[path] = root.all_modules[path]
+                    else:
+                        # Release paths are resolved and known to contain a
+                        # Makefile; there is no need for ``find_makefile``
+                        to_load[path] = (variable_name, path / "Makefile")
+                links.append((dep, variable_name, path))
+        return to_load, links
+
+    @classmethod
+    def _add_release_dependencies(
+        cls,
+        to_load: Dict[pathlib.Path, Tuple[str, pathlib.Path]],
+        links: List[Tuple[Dependency, str, pathlib.Path]],
+        makefiles: Dict[pathlib.Path, Makefile],
+        root: DependencyGroup,
+        release_deps: Dict[pathlib.Path, Dependency],
+        keep_os_env: bool,
+    ) -> List[Dependency]:
+        """
+        Add the loaded dependencies from ``_find_release_dependencies``.
+
+        Returns the new dependencies, which make up the next level to walk.
+        """
+        pending = []
+        for path, (variable_name, makefile_path) in to_load.items():
+            release_deps[path] = cls.from_makefile(
+                makefiles[makefile_path],
+                recurse=False,
+                keep_os_env=keep_os_env,
+                name=variable_name,  # unclear the right approach here
+                variable_name=variable_name,
+                root=root,
+            )
+            pending.append(release_deps[path])
+
+        for dep, variable_name, path in links:
+            release_dep = release_deps[path]
+            release_dep.dependents[dep.variable_name] = dep.path
+            dep.dependencies[variable_name] = release_dep.path
+        return pending
+
 
 @dataclass
 class DependencyGroup:
@@ -582,6 +1896,7 @@ class DependencyGroup:
         keep_os_env: bool = False,
         name: Optional[str] = None,
         variable_name: Optional[str] = None,
+        fast: bool = False,
     ) -> DependencyGroup:
         if makefile.filename is None:
             raise ValueError("The provided Makefile must have a path")
@@ -595,6 +1910,36 @@ class DependencyGroup:
             root=info,
             recurse=recurse,
             variable_name=variable_name,
+            fast=fast,
+        )
+        return info
+
+    @classmethod
+    async def from_makefile_async(
+        cls,
+        makefile: Makefile,
+        recurse: bool = True,
+        *,
+        keep_os_env: bool = False,
+        name: Optional[str] = None,
+        variable_name: Optional[str] = None,
+        fast: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> DependencyGroup:
+        """``from_makefile``, without blocking; see ``Dependency``."""
+        if makefile.filename is None:
+            raise ValueError("The provided Makefile must have a path")
+
+        info = cls(root=makefile.filename.parent, all_modules={})
+        await Dependency.from_makefile_async(
+            makefile=makefile,
+            name=name,
+            keep_os_env=keep_os_env,
+            root=info,
+            recurse=recurse,
+            variable_name=variable_name,
+            fast=fast,
+            max_concurrency=max_concurrency,
         )
         return info
 
@@ -637,34 +1982,49 @@ class DependencyGroupGraph(_GraphHelper):
         super().__init__()
         self.include_code = include_code
         self.highlight_deps = highlight_deps or []
+        self._added_paths: Set[str] = set()
         if dep is not None:
             self.add_dependency(dep)
 
-    def add_dependency(self, item: Union[DependencyGroup, Dependency]):
-        """Add a dependency to the graph."""
-        if isinstance(item, DependencyGroup):
-            for path, mod in item.all_modules.items():
-                self.add_dependency(mod)
-            return
-
-        if item.path in self.nodes:
-            return
+    def _add_dependency_node(self, item: Dependency) -> bool:
+        """Add a node for a dependency, returning False if already added."""
+        label = str(item.path)
+        if label in self._added_paths:
+            return False
+        self._added_paths.add(label)
 
         if item.variable_name != item.name:
             node_text = f"{item.variable_name} {item.name}\n{item.path}"
         else:
             node_text = f"{item.variable_name}\n{item.path}"
 
-        self.get_node(str(item.path), text=node_text)
+        self.get_node(label, text=node_text)
+        return True
 
-        if item.root is None:
-            # Misconfiguration?
-            return
+    def add_dependency(self, item: Union[DependencyGroup, Dependency]):
+        """Add a dependency (or all dependencies of a group) to the graph."""
+        if isinstance(item, DependencyGroup):
+            items = list(item.all_modules.values())
+        else:
+            items = [item]
 
-        for _, dep_path in item.dependencies.items():
-            dep = item.root.all_modules[dep_path]
-            self.add_dependency(dep)
-            self.add_edge(str(item.path), str(dep.path))
+        # Walk breadth-first, visiting each dependency only once regardless of
+        # how many dependents it has:
+        queue = collections.deque(
+            dep for dep in items if self._add_dependency_node(dep)
+        )
+        while queue:
+            dep = queue.popleft()
+            if dep.root is None:
+                # Misconfiguration?
+                continue
+
+            label = str(dep.path)
+            for dep_path in dep.dependencies.values():
+                child = dep.root.all_modules[dep_path]
+                if self._add_dependency_node(child):
+                    queue.append(child)
+                self.add_edge(label, str(child.path))
 
     def _ready_for_digraph(self, graph: gv.Digraph):
         """Hook when the user calls ``to_digraph``."""
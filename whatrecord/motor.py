@@ -1,6 +1,9 @@
 # Auto-generated from R7-2-1-20-gda3bfab4
 # May not be backward/forward-compatible or 100% accurate
 
+from __future__ import annotations
+
+import sys
 from dataclasses import dataclass
 from typing import ClassVar, Dict
 
@@ -1094,6 +1097,8 @@ class MotorState(ShellStateHandler):
         defaultTimeSource: str = "",
     ):
         # SLAC-specific, but doesn't hurt anyone
+        # Port names recur across IOCs; share one string for each:
+        portName = sys.intern(portName)
         self.ports[portName] = asyn.AdsAsynPort(
             context=self.get_load_context(),
             name=portName,
@@ -1117,15 +1122,16 @@ class MotorState(ShellStateHandler):
         card_num: int = 0,
         num_axes: int = 0,
     ):
+        port_name = sys.intern(port_name)
         self.ports[port_name] = asyn.AsynMotor(
             context=self.get_load_context(),
             name=port_name,
             parent=None,
-            metadata=dict(
-                num_axes=num_axes,
-                card_num=card_num,
-                driver_name=driver_name,
-            ),
+            metadata={
+                "num_axes": num_axes,
+                "card_num": card_num,
+                "driver_name": driver_name,
+            },
         )
 
     @_handler
@@ -1138,19 +1144,22 @@ class MotorState(ShellStateHandler):
         idle_poll_rate: float = 0.0,
     ):
         # SLAC-specific
-        port = self.ports[asyn_port]
+        motor_port = sys.intern(motor_port)
+        asyn_port = sys.intern(asyn_port)
+        ports = self.ports
+        port = ports[asyn_port]
         motor = asyn.AsynMotor(
             context=self.get_load_context(),
             name=motor_port,
             parent=asyn_port,
-            metadata=dict(
-                num_axes=num_axes,
-                move_poll_rate=move_poll_rate,
-                idle_poll_rate=idle_poll_rate,
-            ),
+            metadata={
+                "num_axes": num_axes,
+                "move_poll_rate": move_poll_rate,
+                "idle_poll_rate": idle_poll_rate,
+            },
         )
 
         # Tie it to both the original asyn port (as a motor) and also the
         # top-level asyn ports.
         port.motors[motor_port] = motor
-        self.ports[motor_port] = motor
+        ports[motor_port] = motor
@@ -5,6 +5,7 @@ LCLS-specific epicsArch.txt plugin.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
 import pathlib
@@ -57,6 +58,24 @@ class DaqPV:
     comments: List[Comment] = field(default_factory=list)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_grammar(debug: bool = False) -> lark.Lark:
+    """
+    The epicsArch.txt grammar, built once rather than for each file.
+
+    The parser holds no per-file state, so it may be shared by all callers,
+    including the nested calls for included files.
+    """
+    return lark.Lark.open_from_package(
+        "whatrecord",
+        "lcls_epicsarch.lark",
+        search_paths=("grammar",),
+        parser="lalr",
+        propagate_positions=True,
+        debug=debug,
+    )
+
+
 @dataclass
 class LclsEpicsArchFile:
     """Representation of an LCLS-specific DAQ recording epicsArch.txt file."""
@@ -78,15 +97,7 @@ class LclsEpicsArchFile:
         if filename:
             filename = pathlib.Path(filename).resolve()
 
-        grammar = lark.Lark.open_from_package(
-            "whatrecord",
-            "lcls_epicsarch.lark",
-            search_paths=("grammar",),
-            parser="earley",
-            propagate_positions=True,
-            debug=debug,
-        )
-
+        grammar = _get_grammar(debug=debug)
         transformer_ = _EpicsArchTransformer(
             cls, filename, contents, grammar, context=context
         )
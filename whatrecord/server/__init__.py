@@ -1,3 +1,11 @@
-from .server import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name: str):
+    # The server (and aiohttp) are only imported when the entrypoint is used,
+    # such that lightweight modules such as ``server.common`` may be imported
+    # without them.
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -34,5 +34,15 @@ MACRO_INCLUDE_ENV = os.environ.get("WHATRECORD_MACRO_INCLUDE_ENV", "true").lower
 # serialize. 0 to disable maximum length check.
 MACRO_VALUE_MAX_LENGTH = int(os.environ.get("WHATRECORD_MACRO_VALUE_MAX_LENGTH", 1024))
 
+# WHATRECORD_MAKEFILE_CACHE (bool) - reuse Makefile information until the
+# files read by make change; see ``whatrecord.makefile.clear_makefile_cache``.
+MAKEFILE_CACHE = os.environ.get("WHATRECORD_MAKEFILE_CACHE", "").lower() in _true_values
+# WHATRECORD_MAKE_WORKER (bool) - evaluate Makefiles with a single long-lived
+# shell process, rather than starting a new subprocess for each.
+MAKE_WORKER = os.environ.get("WHATRECORD_MAKE_WORKER", "").lower() in _true_values
+# WHATRECORD_MAKE_WORKER_TIMEOUT (float) - seconds to wait for the make worker
+# to evaluate a Makefile before restarting it.
+MAKE_WORKER_TIMEOUT = float(os.environ.get("WHATRECORD_MAKE_WORKER_TIMEOUT", "60"))
+
 # A SLAC-specific setting (other facilities may ignore this):
 EPICS_SITE_TOP = os.environ.get("EPICS_SITE_TOP", "/reg/g/pcds/epics")
@@ -6,9 +6,8 @@ import pathlib
 import shlex
 import textwrap
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
 
-import graphviz as gv
 import lark
 
 from . import transformer
@@ -16,6 +15,9 @@ from .common import AnyPath, FullLoadContext
 from .graph import _GraphHelper
 from .transformer import context_from_token
 
+if TYPE_CHECKING:
+    import graphviz as gv
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,3 +96,26 @@ def test_load_dump(startup_script: pathlib.Path, output_format: str):
 def test_load_misc(filename: pathlib.Path, output_format: str):
     os.environ["PWD"] = str(filename.resolve().parent)
     main(filename, output_format=output_format)
+
+
+def test_shell_state_handlers():
+    state = ShellState()
+    handlers = state._handlers
+    assert handlers["epicsEnvSet"] == state.handle_epicsEnvSet
+    # Sub-handler commands are bound to the sub-handler instance
+    assert handlers["drvAsynIPPortConfigure"].__self__ is state.asyn
+    assert handlers["A3200AsynSetup"].__self__ is state.motor
+    # Another instance gets its own bound handlers
+    assert ShellState()._handlers["epicsEnvSet"].__self__ is not state
+
+
+def test_asyn_port_names_interned():
+    port_names = []
+    for _ in range(2):
+        state = ShellState()
+        # Split from a line, as the shell would
+        port_name = "".join(["PORT", "1"])
+        state._handle_command("drvAsynIPPortConfigure", port_name, "host:1")
+        (port_name,) = state.asyn.ports
+        port_names.append(port_name)
+    assert port_names[0] is port_names[1]
@@ -68,3 +68,16 @@ def test_empty_section():
             """
         )
     )
+
+
+def test_whitespace_and_empty_comments():
+    parsed = epicsarch.LclsEpicsArchFile.from_string(
+        "#\npv1\n  pv2 \t\n#*  desc  \npv3 pva \n\t \n<  missing.txt \n",
+        filename="epicsArch.txt",
+    )
+    # An empty comment does not take the following line with it
+    assert list(parsed.pvs) == ["pv1", "pv2", "pv3"]
+    assert parsed.pvs["pv1"].comments[0].text == ""
+    assert parsed.pvs["pv3"].alias == "desc"
+    assert parsed.pvs["pv3"].provider == "pva"
+    assert [warning.type_ for warning in parsed.warnings] == ["missing_file"]
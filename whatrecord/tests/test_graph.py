@@ -360,3 +360,34 @@ def test_list_value_graph(dbd: Database):
         database_1,
         record_types=dbd.record_types,
     )
+
+
+@pytest.mark.parametrize(
+    "link, supported",
+    [
+        pytest.param("record_a", True, id="record"),
+        pytest.param("record_a.VAL", True, id="record-field"),
+        pytest.param("1", False, id="int"),
+        pytest.param("-1", False, id="negative-int"),
+        pytest.param("1.5", False, id="float"),
+        pytest.param(".5e-3", False, id="float-exponent"),
+        pytest.param("1e5", False, id="int-exponent"),
+        pytest.param("0x10", False, id="hex"),
+        pytest.param("#C0 S0", False, id="vme"),
+        pytest.param("@asyn(port)", False, id="instio"),
+        pytest.param("1abc", True, id="leading-digit"),
+        pytest.param('"abc"', False, id="string"),
+        pytest.param("[1, 2]", False, id="list"),
+        pytest.param('{"const": 3}', False, id="json-const"),
+        pytest.param("True", False, id="bool"),
+        pytest.param("None", False, id="none"),
+        pytest.param("1_000", False, id="underscore-int"),
+        pytest.param("0o7", False, id="octal"),
+        pytest.param("0b11", False, id="binary"),
+        pytest.param("1j", False, id="complex"),
+        pytest.param("(1)", False, id="parenthesized"),
+        pytest.param(" 5", False, id="leading-whitespace"),
+    ],
+)
+def test_is_supported_link(link: str, supported: bool):
+    assert graph.is_supported_link(link) is supported
@@ -239,3 +239,127 @@ def test_parse_failure(source: str, caplog: pytest.LogCaptureFixture):
     caplog.set_level("WARNING", logger=iocmanager.logger.name)
     assert iocmanager.parse_config(source.splitlines()) == []
     assert len(caplog.records) == 1, "Failure to parse id line"
+
+
+def test_load_config_file_cache(tmp_path):
+    config = tmp_path / "iocmanager.cfg"
+
+    def write_config(port: int):
+        config.write_text(
+            "procmgr_config = [\n"
+            f" {{id:'ioc-a', host: 'host-a', port: {port}, dir: '{tmp_path}'}},\n"
+            "]\n"
+        )
+
+    write_config(port=30001)
+    first = iocmanager.load_config_file(config)
+    assert [ioc["port"] for ioc in first] == [30001]
+
+    # Modifying the result should not affect the cached copy
+    first[0]["port"] = 0
+    assert iocmanager.load_config_file(config)[0]["port"] == 30001
+
+    write_config(port=300002)
+    assert iocmanager.load_config_file(config)[0]["port"] == 300002
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_get_iocs_from_configs(tmp_path, max_workers):
+    configs = []
+    for idx, host in enumerate(["host-b", "host-a", "host-c"]):
+        config = tmp_path / f"iocmanager{idx}.cfg"
+        config.write_text(
+            "procmgr_config = [\n"
+            f" {{id:'ioc-{idx}', host: '{host}', port: 3000{idx}, "
+            f"dir: '{tmp_path}'}},\n"
+            "]\n"
+        )
+        configs.append(config)
+
+    # Duplicates are only loaded once
+    iocs = iocmanager.get_iocs_from_configs(
+        configs + [str(configs[0])], max_workers=max_workers
+    )
+    assert [(ioc["host"], ioc["name"]) for ioc in iocs] == [
+        ("host-a", "ioc-1"),
+        ("host-b", "ioc-0"),
+        ("host-c", "ioc-2"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "entry, expected",
+    [
+        pytest.param(
+            "{id:'ioc-a', disable: True, alias: 'a True b', port: 1}",
+            {"id": "ioc-a", "disable": True, "alias": "a True b", "port": 1},
+            id="keyword-in-string",
+        ),
+        pytest.param(
+            """{id:'ioc-a', alias: "it's", history: None}""",
+            {"id": "ioc-a", "alias": "it's", "history": None},
+            id="double-quoted",
+        ),
+        pytest.param(
+            r"{id:'ioc-a', alias: 'it\'s', disable: False}",
+            {"id": "ioc-a", "alias": "it's", "disable": False},
+            id="escaped-quote",
+        ),
+        pytest.param(
+            "{id:'ioc-a', history: ('a', 'b',),}",
+            {"id": "ioc-a", "history": ("a", "b")},
+            id="tuple-trailing-comma",
+        ),
+        pytest.param(
+            r"""{id:'ioc-a', alias: "a\/b"}""",
+            {"id": "ioc-a", "alias": "a\\/b"},
+            id="double-quoted-escape",
+            # Invalid in Python, but left as-is by ast.literal_eval:
+            marks=pytest.mark.filterwarnings("ignore:invalid escape sequence"),
+        ),
+    ]
+)
+def test_parse_literals(entry: str, expected: dict):
+    assert iocmanager.parse_config(["procmgr_config = [", entry, "]"]) == [expected]
+
+
+@pytest.mark.parametrize("constant", ["NaN", "Infinity", "-Infinity"])
+def test_parse_json_constant(constant: str, caplog: pytest.LogCaptureFixture):
+    caplog.set_level("WARNING", logger=iocmanager.logger.name)
+    entry = f"{{id:'ioc-a', host: 'host-a', port: {constant}}}"
+    assert iocmanager.parse_config(["procmgr_config = [", entry, "]"]) == []
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.parametrize(
+    "script, expected",
+    [
+        pytest.param(
+            "children/build/iocBoot/ioc-a/st.cmd",
+            "children/build/iocBoot/ioc-a/st.cmd",
+            id="templated",
+        ),
+        pytest.param(
+            "build/iocBoot/ioc-a/st.cmd", "build/iocBoot/ioc-a/st.cmd", id="build"
+        ),
+        pytest.param("iocBoot/ioc-a/st.cmd", "iocBoot/ioc-a/st.cmd", id="standard"),
+        pytest.param("st.cmd", "st.cmd", id="top-level"),
+        pytest.param(None, "st.cmd", id="missing"),
+    ]
+)
+def test_find_stcmd(tmp_path, script, expected):
+    if script is not None:
+        (tmp_path / script).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / script).touch()
+    assert iocmanager.find_stcmd(str(tmp_path), "ioc-a") == str(tmp_path / expected)
+
+
+def test_find_stcmd_priority_after_cache(tmp_path):
+    (tmp_path / "st.cmd").touch()
+    assert iocmanager.find_stcmd(str(tmp_path), "ioc-a") == str(tmp_path / "st.cmd")
+
+    # A script of higher priority is preferred over the cached one
+    script = tmp_path / "children" / "build" / "iocBoot" / "ioc-a" / "st.cmd"
+    script.parent.mkdir(parents=True)
+    script.touch()
+    assert iocmanager.find_stcmd(str(tmp_path), "ioc-a") == str(script)
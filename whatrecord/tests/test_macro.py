@@ -3,7 +3,7 @@ import os
 import apischema
 import pytest
 
-from .. import settings
+from .. import macro, settings
 from ..macro import MacroContext, PassthroughMacroContext
 
 
@@ -54,6 +54,19 @@ def test_env_include_exclude(monkeypatch, include: bool):
         assert 0 < len(set(keys)) <= len(os.environ)
 
 
+@pytest.mark.parametrize(
+    "macro_string, expected",
+    [
+        pytest.param("", {}, id="empty"),
+        pytest.param(" , ,\t", {}, id="separators"),
+        pytest.param("A", {"A": ""}, id="no-value"),
+        pytest.param("A=1, B=2,", {"A": "1", "B": "2"}, id="values"),
+    ],
+)
+def test_macros_from_string(macro_string: str, expected: dict):
+    assert macro.macros_from_string(macro_string) == expected
+
+
 def test_passthrough():
     ctx = PassthroughMacroContext()
     assert ctx.expand("$(ABC)") == "$(ABC)"
@@ -64,3 +77,57 @@ def test_passthrough():
     deserialized = apischema.deserialize(MacroContext, serialized)
     assert isinstance(deserialized, PassthroughMacroContext)
     assert deserialized.expand("$(ABC)") == "$(ABC)"
+
+
+@pytest.mark.parametrize(
+    "key, serialize",
+    [
+        pytest.param("MY_TOKEN_VALUE", False, id="token"),
+        pytest.param("GITHUB", False, id="github"),
+        pytest.param("ABC", True, id="included"),
+        pytest.param("", False, id="empty"),
+    ]
+)
+def test_should_serialize_key(monkeypatch, key: str, serialize: bool):
+    monkeypatch.setattr(settings, "MACRO_INCLUDE_ENV", True)
+    assert macro.should_serialize_key(key, "value") is serialize
+
+
+def test_set_serialization_settings():
+    try:
+        macro.set_serialization_settings(skip="['A.*', '.*Z']")
+        assert not macro.should_serialize_key("ABC", "value")
+        assert not macro.should_serialize_key("XYZ", "value")
+        assert macro.should_serialize_key("BCD", "value")
+
+        macro.set_serialization_settings(skip="[]")
+        assert macro.should_serialize_key("ABC", "value")
+    finally:
+        macro.set_serialization_settings()
+
+
+def test_macros_from_string_copy():
+    macros = macro.macros_from_string("A=1,B=2")
+    assert macros == {"A": "1", "B": "2"}
+    # The result is the caller's to modify; the cached value is unaffected
+    macros["C"] = "3"
+    assert macro.macros_from_string("A=1,B=2") == {"A": "1", "B": "2"}
+
+
+def test_serialize_updates(monkeypatch):
+    monkeypatch.setattr(settings, "MACRO_INCLUDE_ENV", True)
+    ctx = MacroContext(use_environment=False)
+    ctx.define(A="1")
+    assert apischema.serialize(MacroContext, ctx)["macros"] == {"A": "1"}
+    assert apischema.serialize(MacroContext, ctx)["macros"] == {"A": "1"}
+
+    # Updates to the context are reflected in the next serialization
+    ctx.define(B="2")
+    assert apischema.serialize(MacroContext, ctx)["macros"] == {"A": "1", "B": "2"}
+
+    # As are changes to the serialization settings
+    try:
+        macro.set_serialization_settings(skip="['B']")
+        assert apischema.serialize(MacroContext, ctx)["macros"] == {"A": "1"}
+    finally:
+        macro.set_serialization_settings()
@@ -1,4 +1,5 @@
 import dataclasses
+import os
 import pathlib
 import subprocess
 import textwrap
@@ -6,7 +7,7 @@ from typing import Optional, Set, Tuple
 
 import pytest
 
-from .. import makefile
+from .. import makefile, settings
 from .conftest import MODULE_PATH, skip_without_make
 
 DEPS_MAKEFILE_ROOT = MODULE_PATH / "deps"
@@ -15,6 +16,17 @@ DEPS_MAKEFILE_ROOT = MODULE_PATH / "deps"
 makefile.logger.setLevel("DEBUG")
 
 
+@pytest.fixture(autouse=True)
+def clear_makefile_cache():
+    makefile.clear_makefile_cache()
+
+
+@pytest.fixture
+def makefile_cache(monkeypatch):
+    """Enable the (opt-in) ``Makefile.from_file`` cache."""
+    monkeypatch.setattr(settings, "MAKEFILE_CACHE", True)
+
+
 def prune_result(
     result: makefile.Makefile,
     expected: makefile.Makefile,
@@ -51,11 +63,11 @@ def get_makefile(contents: str, *, set_filename: bool = True) -> makefile.Makefi
 
 
 def get_dependency_group(
-    contents: str, *, set_filename: bool = True
+    contents: str, *, set_filename: bool = True, fast: bool = False
 ) -> Tuple[makefile.Makefile, makefile.DependencyGroup]:
     """Get a DependencyGroup instance given a single Makefile's contents."""
     root = get_makefile(contents, set_filename=set_filename)
-    group = makefile.DependencyGroup.from_makefile(root)
+    group = makefile.DependencyGroup.from_makefile(root, fast=fast)
     if set_filename:
         assert root.filename is not None
         assert group.root == root.filename.parent
@@ -305,3 +317,372 @@ def test_dependency_group_graph():
 
     # Smoke test to_digraph
     graph.to_digraph()
+
+
+@skip_without_make
+@pytest.mark.parametrize("max_workers", [1, 2, None])
+def test_from_files(max_workers: Optional[int]):
+    filenames = [
+        DEPS_MAKEFILE_ROOT / name / "Makefile"
+        for name in ("base", "module_a", "module_c")
+    ]
+    makefiles = makefile.Makefile.from_files(filenames, max_workers=max_workers)
+    assert list(makefiles) == filenames
+    for filename in filenames:
+        expected = makefile.Makefile.from_file(filename)
+        result = makefiles[filename]
+        assert result.filename == filename
+        assert result.release_top_vars == expected.release_top_vars
+        assert result.makefile_list == [str(filename.resolve())]
+        assert expected.makefile_list == result.makefile_list
+        for var in expected.release_top_vars:
+            assert result.env[var] == expected.env[var]
+
+
+@skip_without_make
+@pytest.mark.parametrize("max_concurrency", [1, None])
+async def test_from_files_async(max_concurrency: Optional[int]):
+    filenames = [
+        DEPS_MAKEFILE_ROOT / name / "Makefile"
+        for name in ("base", "module_a", "module_c")
+    ]
+    expected = {
+        filename: makefile.Makefile.from_file(filename) for filename in filenames
+    }
+    makefile._makefile_cache.clear()
+    makefiles = await makefile.Makefile.from_files_async(
+        filenames, max_concurrency=max_concurrency
+    )
+    assert list(makefiles) == filenames
+    for filename in filenames:
+        result = makefiles[filename]
+        assert result.filename == filename
+        assert result.release_top_vars == expected[filename].release_top_vars
+        assert result.makefile_list == [str(filename.resolve())]
+        for var in result.release_top_vars:
+            assert result.env[var] == expected[filename].env[var]
+
+
+@skip_without_make
+def test_make_worker(monkeypatch):
+    filename = DEPS_MAKEFILE_ROOT / "module_c" / "Makefile"
+    expected = makefile.Makefile.from_file(filename)
+
+    monkeypatch.setattr(settings, "MAKE_WORKER", True)
+    # Requests are handled one after another by the same worker
+    for _ in range(2):
+        makefile._makefile_cache.clear()
+        result = makefile.Makefile.from_file(filename)
+        assert result.filename == filename
+        assert result.release_top_vars == expected.release_top_vars
+        assert result.makefile_list == [str(filename.resolve())]
+        for var in expected.release_top_vars:
+            assert result.env[var] == expected.env[var]
+
+
+@skip_without_make
+def test_make_worker_restart(tmp_path: pathlib.Path, monkeypatch):
+    filename = tmp_path / "Makefile"
+    filename.write_text("WHATREC_A=$(WHATREC_ENV)\n")
+    worker = makefile._MakeWorker()
+
+    def evaluate() -> makefile.Makefile:
+        output, _ = worker.evaluate(filename, working_directory=tmp_path)
+        return makefile.Makefile._from_make_output(output, tmp_path)
+
+    try:
+        monkeypatch.setenv("WHATREC_ENV", "1")
+        assert evaluate().env["WHATREC_A"] == "1"
+        # The worker follows changes to the environment
+        monkeypatch.setenv("WHATREC_ENV", "2")
+        assert evaluate().env["WHATREC_A"] == "2"
+
+        # A dead worker is replaced
+        worker._proc.kill()
+        worker._proc.wait()
+        assert evaluate().env["WHATREC_A"] == "2"
+
+        # As is one which takes too long
+        filename.write_text(
+            "WHATREC_A=$(WHATREC_ENV)\n"
+            "$(if $(WHATREC_HANG),$(shell sleep 30))\n"
+        )
+        monkeypatch.setattr(settings, "MAKE_WORKER_TIMEOUT", 0.5)
+        monkeypatch.setenv("WHATREC_HANG", "1")
+        with pytest.raises(subprocess.TimeoutExpired):
+            evaluate()
+        assert worker._proc is None
+
+        monkeypatch.delenv("WHATREC_HANG")
+        assert evaluate().env["WHATREC_A"] == "2"
+
+        # make errors are available
+        filename.write_text("$(warning whatrecord-warning)\n")
+        _, stderr = worker.evaluate(
+            filename, working_directory=tmp_path, capture_stderr=True
+        )
+        assert "whatrecord-warning" in stderr
+    finally:
+        worker.close()
+
+
+@skip_without_make
+def test_from_file_cache(tmp_path: pathlib.Path, makefile_cache):
+    filename = tmp_path / "Makefile"
+    include = tmp_path / "CONFIG"
+    filename.write_text("include CONFIG\nWHATREC_A=$(WHATREC_B)\n")
+    include.write_text("WHATREC_B=1\n")
+
+    first = makefile.Makefile.from_file(filename)
+    assert first.env["WHATREC_A"] == "1"
+
+    # Modifying the result should not affect the cached copy
+    first.env["WHATREC_A"] = "0"
+    assert makefile.Makefile.from_file(filename).env["WHATREC_A"] == "1"
+
+    # Nor should the cached copy outlive changes to included files
+    include.write_text("WHATREC_B=2\n")
+    stat = include.stat()
+    os.utime(include, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert makefile.Makefile.from_file(filename).env["WHATREC_A"] == "2"
+
+
+@skip_without_make
+@pytest.mark.parametrize("enabled", [False, True])
+def test_from_file_cache_untracked(
+    tmp_path: pathlib.Path, monkeypatch, enabled: bool
+):
+    monkeypatch.setattr(settings, "MAKEFILE_CACHE", enabled)
+    monkeypatch.setenv("WHATREC_ENV", "1")
+    filename = tmp_path / "Makefile"
+    filename.write_text(
+        "WHATREC_A=$(WHATREC_ENV)\n"
+        "WHATREC_B=1\n"
+        "-include $(TOP)local.mk\n"
+    )
+    variables = {"TOP": f"{tmp_path}/"}
+    first = makefile.Makefile.from_file(filename, variables=variables)
+    assert first.env["WHATREC_A"] == "1"
+    assert first.env["WHATREC_B"] == "1"
+
+    # Changes to the environment are picked up, with or without the cache
+    monkeypatch.setenv("WHATREC_ENV", "2")
+    result = makefile.Makefile.from_file(filename, variables=variables)
+    assert result.env["WHATREC_A"] == "2"
+
+    # A newly-created optional include is not tracked by the cache...
+    (tmp_path / "local.mk").write_text("WHATREC_B=2\n")
+    result = makefile.Makefile.from_file(filename, variables=variables)
+    assert result.env["WHATREC_B"] == ("1" if enabled else "2")
+
+    # ... and needs the cache to be cleared
+    makefile.clear_makefile_cache()
+    result = makefile.Makefile.from_file(filename, variables=variables)
+    assert result.env["WHATREC_B"] == "2"
+
+
+@skip_without_make
+def test_from_file_persistent_cache(
+    tmp_path: pathlib.Path, monkeypatch, makefile_cache
+):
+    cache_path = tmp_path / "cache"
+    cache_path.mkdir()
+    monkeypatch.setattr(makefile._CachedMakefile, "_cache_path_", cache_path)
+
+    filename = tmp_path / "Makefile"
+    filename.write_text("WHATREC_A=1\nRELEASE_TOPS=WHATREC_A\n")
+    first = makefile.Makefile.from_file(filename)
+    assert len(list(cache_path.iterdir())) == 1
+
+    def no_make(*args, **kwargs):
+        raise AssertionError("Makefile should have been loaded from the cache")
+
+    # A new process (i.e., an empty in-memory cache) can use the saved result
+    makefile._makefile_cache.clear()
+    with monkeypatch.context() as m:
+        m.setattr(makefile.Makefile, "_from_file", no_make)
+        assert makefile.Makefile.from_file(filename) == first
+
+    # Unless the Makefile has since changed
+    makefile._makefile_cache.clear()
+    filename.write_text("WHATREC_A=2\n")
+    stat = filename.stat()
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert makefile.Makefile.from_file(filename).env["WHATREC_A"] == "2"
+
+    # Nor may it be reused with another environment
+    filename.write_text("WHATREC_A=$(WHATREC_ENV)\n")
+    monkeypatch.setenv("WHATREC_ENV", "1")
+    assert makefile.Makefile.from_file(filename).env["WHATREC_A"] == "1"
+    makefile._makefile_cache.clear()
+    monkeypatch.setenv("WHATREC_ENV", "2")
+    assert makefile.Makefile.from_file(filename).env["WHATREC_A"] == "2"
+
+    # Clearing the cache removes the saved results as well
+    makefile.clear_makefile_cache()
+    assert not list(cache_path.iterdir())
+
+
+def test_split_sections():
+    output = "\n".join(
+        (
+            "--whatrecord-section-start--env",
+            "A=1\0B=multi\n\nline\0--whatrecord-section-end--",
+            "--whatrecord-section-start--default_goal",
+            "all",
+            "--whatrecord-section-end--",
+        )
+    )
+    sections = makefile.Makefile._split_sections(output)
+    assert sections == {"env": "A=1\0B=multi\n\nline\0", "default_goal": "all"}
+    assert makefile.Makefile._get_env(sections, keep_os_env=True) == {
+        "A": "1",
+        "B": "multi\n\nline",
+    }
+
+    # The final section may extend to the end of the output
+    trailing = makefile.Makefile._split_sections(
+        "--whatrecord-section-start--default_goal\nall\n"
+        "--whatrecord-section-end--\n"
+        "--whatrecord-section-start--env\nA=1\0B=2\0"
+    )
+    assert trailing == {"default_goal": "all", "env": "A=1\0B=2\0"}
+
+
+def test_from_make_output_independent():
+    start = makefile._section_start_marker
+    end = makefile._section_end_marker
+    output = (
+        f"{start}makefile_list\nMakefile\n{end}\n"
+        f"{start}env\n_WR_TEST_A=1\0RELEASE_TOPS=_WR_TEST_A"
+    )
+    first = makefile.Makefile._from_make_output(output, "/", filename="/a/Makefile")
+    second = makefile.Makefile._from_make_output(output, "/", filename="/b/Makefile")
+    assert first.env == second.env == {"_WR_TEST_A": "1", "RELEASE_TOPS": "_WR_TEST_A"}
+    assert second.filename == pathlib.Path("/b/Makefile")
+    # Makefiles from the same output are independent
+    first.env["_WR_TEST_A"] = "2"
+    first.makefile_list.append("other")
+    assert second.env["_WR_TEST_A"] == "1"
+    assert second.makefile_list == ["Makefile"]
+
+
+def test_from_make_output_os_environ(monkeypatch):
+    output = f"{makefile._section_start_marker}env\n_WR_TEST_A=1\0_WR_TEST_B=2"
+    monkeypatch.delenv("_WR_TEST_A", raising=False)
+    first = makefile.Makefile._from_make_output(output, "/")
+    assert first.env == {"_WR_TEST_A": "1", "_WR_TEST_B": "2"}
+    # The same output is filtered against the current environment
+    monkeypatch.setenv("_WR_TEST_A", "1")
+    second = makefile.Makefile._from_make_output(output, "/")
+    assert second.env == {"_WR_TEST_B": "2"}
+
+
+@pytest.mark.parametrize("keep_os_env", [False, True])
+def test_get_env_os_environ(monkeypatch, keep_os_env: bool):
+    monkeypatch.setenv("_WR_TEST_SAME", "a=b")
+    monkeypatch.setenv("_WR_TEST_CHANGED", "1")
+    sections = {"env": "_WR_TEST_SAME=a=b\0_WR_TEST_CHANGED=2\0_WR_TEST_NEW=3"}
+    env = makefile.Makefile._get_env(sections, keep_os_env=keep_os_env)
+    expected = {"_WR_TEST_CHANGED": "2", "_WR_TEST_NEW": "3"}
+    if keep_os_env:
+        expected["_WR_TEST_SAME"] = "a=b"
+    assert env == expected
+
+
+@skip_without_make
+@pytest.mark.parametrize("full_env", [False, True])
+def test_full_env(full_env: bool):
+    mk = makefile.Makefile.from_string(
+        """
+        A=1
+        B=$(A) 2
+        UNUSED=3
+        RELEASE_TOPS=A B C
+        BUILD_ARCHS=x y
+        """.replace(" " * 8, ""),
+        filename="/tmp/Makefile",
+        full_env=full_env,
+    )
+    assert mk.release_top_vars == ["A", "B", "C"]
+    assert mk.build_archs == ["x", "y"]
+    assert mk.env["A"] == "1"
+    assert mk.env["B"] == "1 2"
+    assert "C" not in mk.env
+    assert ("UNUSED" in mk.env) is full_env
+
+
+@skip_without_make
+@pytest.mark.parametrize("fast", [False, True])
+def test_dependency_group_fast(fast: bool):
+    _, group = get_dependency_group(
+        f"""
+        EPICS_BASE={DEPS_MAKEFILE_ROOT}/base
+        MODULE_C={DEPS_MAKEFILE_ROOT}/module_c
+        RELEASE_TOPS=EPICS_BASE MODULE_C
+        """,
+        fast=fast,
+    )
+    assert len(group.all_modules) == 5
+    base = check_module_in_group(group, "EPICS_BASE", DEPS_MAKEFILE_ROOT / "base")
+    # base has no includes or RELEASE_TOPS, so make is skipped for it:
+    assert bool(base.makefile.env) is not fast
+    mc = check_module_in_group(group, "MODULE_C", DEPS_MAKEFILE_ROOT / "module_c")
+    assert mc.makefile.env
+
+
+@skip_without_make
+async def test_dependency_group_async():
+    root = get_makefile(
+        f"""
+        EPICS_BASE={DEPS_MAKEFILE_ROOT}/base
+        MODULE_C={DEPS_MAKEFILE_ROOT}/module_c
+        RELEASE_TOPS=EPICS_BASE MODULE_C
+        """
+    )
+    group = await makefile.DependencyGroup.from_makefile_async(
+        root, max_concurrency=2
+    )
+    expected = makefile.DependencyGroup.from_makefile(root)
+    assert set(group.all_modules) == set(expected.all_modules)
+    for path, dep in group.all_modules.items():
+        assert dep.dependencies == expected.all_modules[path].dependencies
+        assert dep.dependents == expected.all_modules[path].dependents
+
+
+@skip_without_make
+def test_dependency_groups_share_makefiles(monkeypatch, makefile_cache):
+    contents = f"""
+        EPICS_BASE={DEPS_MAKEFILE_ROOT}/base
+        MODULE_C={DEPS_MAKEFILE_ROOT}/module_c
+        RELEASE_TOPS=EPICS_BASE MODULE_C
+        """
+    _, first = get_dependency_group(contents)
+
+    def no_make(*args, **kwargs):
+        raise AssertionError("Dependency Makefiles should have been cached")
+
+    # A later scan sharing the same dependencies does not run make for them
+    monkeypatch.setattr(makefile.Makefile, "_from_files", no_make)
+    _, second = get_dependency_group(contents)
+    assert set(second.all_modules) == set(first.all_modules)
+    for path, dep in second.all_modules.items():
+        assert dep.root is second
+        if path != second.root:
+            assert dep.makefile == first.all_modules[path].makefile
+
+
+@skip_without_make
+def test_from_bytes(tmp_path: pathlib.Path):
+    filename = tmp_path / "Makefile"
+    # Passed through to make as-is, which handles the line endings itself
+    filename.write_bytes(b"A = 1\r\nB = \xc3\xa9\r\nRELEASE_TOPS = A B\r\n")
+    with open(filename, "rb") as fp:
+        from_bytes = makefile.Makefile.from_file_obj(fp)
+    with open(filename, "rt", encoding="utf-8") as fp:
+        from_text = makefile.Makefile.from_file_obj(fp)
+
+    for makefile_ in (from_bytes, from_text):
+        assert makefile_.release_top_vars == ["A", "B"]
+        assert makefile_.env["A"] == "1"
+        assert makefile_.env["B"] == "é"
@@ -1,6 +1,9 @@
+import shlex
+import sys
+
 import pytest
 
-from .. import common
+from .. import common, util
 from ..common import LoadContext
 
 
@@ -22,3 +25,9 @@ from ..common import LoadContext
 )
 def test_redundant_context(ctx, expected):
     assert common.remove_redundant_context(ctx) == expected
+
+
+async def test_run_script_with_json_output():
+    code = 'import json; print(json.dumps([{"a": 1}]))'
+    script = f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+    assert await util.run_script_with_json_output(script) == [{"a": 1}]